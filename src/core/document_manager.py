@@ -4,8 +4,13 @@ Document Manager - Handles SQLite database operations for documents and images
 
 import sqlite3
 import os
+import re
 import logging
-from datetime import datetime
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from urllib.request import pathname2url
 from typing import List, Optional, Tuple, Dict
 from functools import lru_cache
 import hashlib
@@ -14,6 +19,9 @@ import hashlib
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_READER_POOL_SIZE = 4  # Idle read-only connections kept for file databases
+_LIKE_SPECIAL_RE = re.compile(r'[\\%_]')  # Characters escaped in LIKE patterns
+
 
 class Document:
     def __init__(self, id: int = None, title: str = "", content: str = "", 
@@ -27,6 +35,20 @@ class Document:
         self._is_content_loaded = content is not None and content != ""
 
 
+class SearchHit:
+    """A document matched by search_documents"""
+    __slots__ = ('id', 'title', 'updated_at', 'title_matches', 'content_matches', 'match_count')
+
+    def __init__(self, id: int, title: str, updated_at: str, title_matches: bool,
+                 content_matches: List[str]):
+        self.id = id
+        self.title = title
+        self.updated_at = updated_at
+        self.title_matches = title_matches
+        self.content_matches = content_matches
+        self.match_count = int(title_matches) + len(content_matches)
+
+
 class DocumentManager:
     def __init__(self, db_path: str = "documents.db"):
         self.db_path = db_path
@@ -39,7 +61,12 @@ class DocumentManager:
         self._chunk_size = 8192  # Chunk size for large document loading
         self._preload_cache = {}  # Cache for preloaded document chunks
         self._access_times = {}  # Track access times for LRU eviction
+        self._cache_lock = threading.RLock()  # Guards the caches above; saves run on a worker thread
+        self._cache_generation = 0  # Bumped on invalidation so reads that raced a write don't cache
         self._connection = None  # Persistent connection for in-memory databases
+        self._write_lock = threading.RLock()  # One writer at a time (re-entrant for nested reads)
+        self._writer = None  # Persistent writer connection for file databases
+        self._readers = queue.Queue(maxsize=_READER_POOL_SIZE)  # Idle read-only connections
         self.init_database()
     
     def init_database(self):
@@ -47,10 +74,13 @@ class DocumentManager:
         try:
             # For in-memory databases, keep a persistent connection
             if self.db_path == ':memory:':
-                self._connection = sqlite3.connect(self.db_path)
+                self._connection = self._connect()
                 conn = self._connection
             else:
-                conn = sqlite3.connect(self.db_path)
+                conn = self._connect()
+                # WAL is a property of the database file, so set it once; readers
+                # then no longer wait on writers and commits append to the log
+                conn.execute("PRAGMA journal_mode=WAL")
             
             cursor = conn.cursor()
             
@@ -77,6 +107,12 @@ class DocumentManager:
                 )
             ''')
             
+            # Sidebar listings are ordered newest first; let them walk an index
+            # instead of sorting the whole table
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_docs_updated ON documents (updated_at DESC)
+            ''')
+            
             conn.commit()
             
             # Only close if not using persistent connection
@@ -88,12 +124,66 @@ class DocumentManager:
             logger.error(f"Database initialization failed: {e}")
             raise RuntimeError(f"Failed to initialize database: {e}")
     
-    def _get_connection(self):
-        """Get database connection (persistent for in-memory, new for file-based)"""
-        if self.db_path == ':memory:' and self._connection:
-            return self._connection
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a connection with per-connection performance pragmas applied"""
+        # Pooled connections are handed between the GUI and save-worker threads,
+        # always under the write lock or a reader checkout
+        if read_only:
+            uri = f"file:{pathname2url(os.path.abspath(self.db_path))}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
         else:
-            return sqlite3.connect(self.db_path)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # NORMAL is durable under WAL (only the last commit can be lost on power
+        # failure) and skips the fsync per transaction that FULL does
+        conn.executescript(
+            "PRAGMA synchronous=NORMAL;"
+            "PRAGMA cache_size=-65536;"    # 64 MiB page cache
+            "PRAGMA temp_store=MEMORY;"
+            "PRAGMA mmap_size=268435456;"  # 256 MiB memory-mapped reads
+        )
+        return conn
+    
+    @contextmanager
+    def _write_connection(self):
+        """Yield the single writer connection, serialized by the write lock"""
+        with self._write_lock:
+            if self.db_path == ':memory:':
+                conn = self._connection
+            else:
+                if self._writer is None:
+                    self._writer = self._connect()
+                conn = self._writer
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+    
+    @contextmanager
+    def _read_connection(self):
+        """Check out a read-only connection; under WAL readers never wait on the writer"""
+        if self.db_path == ':memory:':
+            # An in-memory database exists only on its one connection
+            with self._write_lock:
+                yield self._connection
+            return
+        
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = self._connect(read_only=True)
+        try:
+            # One deferred transaction keeps the snapshot stable for the whole read
+            conn.execute("BEGIN DEFERRED")
+            try:
+                yield conn
+            finally:
+                conn.rollback()
+        finally:
+            try:
+                self._readers.put_nowait(conn)
+            except queue.Full:
+                conn.close()
     
     def create_document(self, title: str, content: str = "") -> int:
         """Create a new document and return its ID"""
@@ -101,9 +191,7 @@ class DocumentManager:
             if not title.strip():
                 raise ValueError("Document title cannot be empty")
             
-            # Use persistent connection for in-memory DB
-            if self.db_path == ':memory:':
-                conn = self._connection
+            with self._write_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     INSERT INTO documents (title, content)
@@ -111,15 +199,6 @@ class DocumentManager:
                 ''', (title.strip(), content))
                 conn.commit()
                 doc_id = cursor.lastrowid
-            else:
-                with sqlite3.connect(self.db_path) as conn:
-                    cursor = conn.cursor()
-                    cursor.execute('''
-                        INSERT INTO documents (title, content)
-                        VALUES (?, ?)
-                    ''', (title.strip(), content))
-                    conn.commit()
-                    doc_id = cursor.lastrowid
                     
             logger.info(f"Created document '{title}' with ID {doc_id}")
             return doc_id
@@ -130,21 +209,49 @@ class DocumentManager:
             logger.error(f"Invalid document data: {e}")
             raise
     
+    def create_documents(self, documents: List[Tuple[str, str]]) -> List[int]:
+        """Create several (title, content) documents in one transaction and return their IDs"""
+        try:
+            if any(not title.strip() for title, _ in documents):
+                raise ValueError("Document title cannot be empty")
+            
+            # One commit for the whole batch; the INSERT is parsed once and
+            # reused from the connection's statement cache
+            with self._write_connection() as conn:
+                cursor = conn.cursor()
+                doc_ids = []
+                for title, content in documents:
+                    cursor.execute('''
+                        INSERT INTO documents (title, content)
+                        VALUES (?, ?)
+                    ''', (title.strip(), content))
+                    doc_ids.append(cursor.lastrowid)
+                conn.commit()
+            
+            logger.info(f"Created {len(doc_ids)} documents")
+            return doc_ids
+        except sqlite3.Error as e:
+            logger.error(f"Failed to create documents: {e}")
+            raise RuntimeError(f"Failed to create documents: {e}")
+        except ValueError as e:
+            logger.error(f"Invalid document data: {e}")
+            raise
+    
     def get_document(self, doc_id: int, load_content: bool = True) -> Optional[Document]:
         """Retrieve a document by ID with enhanced caching and lazy loading"""
         try:
             # Check cache first
             cache_key = f"{doc_id}_{load_content}"
-            if cache_key in self._document_cache:
-                return self._document_cache[cache_key]
-            
-            # Check metadata cache for non-content requests
-            if not load_content and doc_id in self._metadata_cache:
-                return self._metadata_cache[doc_id]
+            with self._cache_lock:
+                cached = self._document_cache.get(cache_key)
+                # Check metadata cache for non-content requests
+                if cached is None and not load_content:
+                    cached = self._metadata_cache.get(doc_id)
+                generation = self._cache_generation
+            if cached is not None:
+                return cached
             
-            conn = self._get_connection()
-            should_close = self.db_path != ':memory:'
-            try:
+            with self._read_connection() as conn:
                 cursor = conn.cursor()
                 
                 if load_content:
@@ -164,7 +271,7 @@ class DocumentManager:
                     if row:
                         doc = Document(row[0], row[1], row[2], row[3], row[4], row[5])
                         # Cache the document with size limit
-                        self._cache_document(cache_key, doc)
+                        self._cache_document(cache_key, doc, generation)
                         return doc
                 else:
                     # Load metadata only for large document optimization
@@ -178,13 +285,12 @@ class DocumentManager:
                         doc = Document(row[0], row[1], row[2], row[3], row[4], row[5])
                         doc._is_content_loaded = False
                         # Cache metadata separately
-                        self._metadata_cache[doc_id] = doc
+                        with self._cache_lock:
+                            if generation == self._cache_generation:
+                                self._metadata_cache[doc_id] = doc
                         return doc
                 
                 return None
-            finally:
-                if should_close:
-                    conn.close()
         except sqlite3.Error as e:
             logger.error(f"Failed to retrieve document {doc_id}: {e}")
             return None
@@ -192,7 +298,7 @@ class DocumentManager:
     def get_all_documents(self, load_content: bool = False) -> List[Document]:
         """Retrieve all documents with enhanced lazy loading and caching"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._read_connection() as conn:
                 cursor = conn.cursor()
                 
                 if load_content:
@@ -213,33 +319,66 @@ class DocumentManager:
                     return documents
                 else:
                     # Load metadata only for sidebar display (optimized for performance)
+                    with self._cache_lock:
+                        generation = self._cache_generation
                     cursor.execute('''
                         SELECT id, title, '', created_at, updated_at, LENGTH(content)
                         FROM documents ORDER BY updated_at DESC
                     ''')
                     documents = []
-                    for row in cursor.fetchall():
-                        doc_id = row[0]
-                        # Check metadata cache first
-                        if doc_id in self._metadata_cache:
-                            documents.append(self._metadata_cache[doc_id])
-                        else:
-                            doc = Document(row[0], row[1], row[2], row[3], row[4], row[5])
-                            doc._is_content_loaded = False
-                            self._metadata_cache[doc_id] = doc
+                    rows = cursor.fetchall()
+                    with self._cache_lock:
+                        cacheable = generation == self._cache_generation
+                        for row in rows:
+                            doc_id = row[0]
+                            # Check metadata cache first
+                            doc = self._metadata_cache.get(doc_id)
+                            if doc is None:
+                                doc = Document(row[0], row[1], row[2], row[3], row[4], row[5])
+                                doc._is_content_loaded = False
+                                if cacheable:
+                                    self._metadata_cache[doc_id] = doc
                             documents.append(doc)
                     return documents
         except sqlite3.Error as e:
             logger.error(f"Failed to retrieve documents: {e}")
             return []
     
+    def count_documents(self) -> int:
+        """Return the number of documents without reading any rows into Python"""
+        try:
+            with self._read_connection() as conn:
+                return conn.execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+        except sqlite3.Error as e:
+            logger.error(f"Failed to count documents: {e}")
+            return 0
+    
+    def list_documents(self, offset: int = 0, limit: int = 200) -> List[Document]:
+        """Return one page of sidebar metadata (id, title, updated_at), newest first"""
+        try:
+            with self._read_connection() as conn:
+                # Unlike get_all_documents this never touches content, not even LENGTH()
+                cursor = conn.execute('''
+                    SELECT id, title, updated_at FROM documents
+                    ORDER BY updated_at DESC LIMIT ? OFFSET ?
+                ''', (limit, offset))
+                documents = []
+                for doc_id, title, updated_at in cursor:
+                    doc = Document(doc_id, title, "", updated_at=updated_at)
+                    doc._is_content_loaded = False
+                    documents.append(doc)
+                return documents
+        except sqlite3.Error as e:
+            logger.error(f"Failed to list documents: {e}")
+            return []
+    
     def update_document(self, doc_id: int, title: str = None, content: str = None):
         """Update a document's title and/or content"""
         try:
             if title is not None and not title.strip():
                 raise ValueError("Document title cannot be empty")
                 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_connection() as conn:
                 cursor = conn.cursor()
                 
                 if title is not None and content is not None:
@@ -280,7 +419,7 @@ class DocumentManager:
     def delete_document(self, doc_id: int):
         """Delete a document and its associated images"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_connection() as conn:
                 cursor = conn.cursor()
                 
                 # Delete associated images first
@@ -301,6 +440,28 @@ class DocumentManager:
             logger.error(f"Invalid delete operation: {e}")
             raise
     
+    def delete_documents(self, doc_ids: List[int]) -> int:
+        """Delete several documents and their images in one transaction, return how many were removed"""
+        try:
+            params = [(doc_id,) for doc_id in doc_ids]
+            
+            # Each DELETE is prepared once and stepped per ID; a single commit covers the batch
+            with self._write_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany('DELETE FROM images WHERE document_id = ?', params)
+                cursor.executemany('DELETE FROM documents WHERE id = ?', params)
+                deleted = cursor.rowcount
+                conn.commit()
+            
+            for doc_id in doc_ids:
+                self._invalidate_document_cache(doc_id)
+            
+            logger.info(f"Deleted {deleted} documents")
+            return deleted
+        except sqlite3.Error as e:
+            logger.error(f"Failed to delete documents: {e}")
+            raise RuntimeError(f"Failed to delete documents: {e}")
+    
     def store_image(self, document_id: int, filename: str, image_data: bytes) -> int:
         """Store an image associated with a document"""
         try:
@@ -309,7 +470,7 @@ class DocumentManager:
             if not image_data:
                 raise ValueError("Image data cannot be empty")
                 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     INSERT INTO images (document_id, filename, data)
@@ -329,12 +490,15 @@ class DocumentManager:
     def get_image(self, image_id: int) -> Optional[Tuple[str, bytes]]:
         """Retrieve an image by ID with enhanced caching and compression, returns (filename, data)"""
         try:
-            # Check cache first with access time tracking
-            if image_id in self._image_cache:
-                self._update_access_time(f"image_{image_id}")
-                return self._image_cache[image_id]
+            # Check cache first with access time tracking (the preview's render worker
+            # reads images too, so look up and touch under the cache lock)
+            with self._cache_lock:
+                cached = self._image_cache.get(image_id)
+                if cached is not None:
+                    self._update_access_time(f"image_{image_id}")
+                    return cached
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._read_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT filename, data FROM images WHERE id = ?
@@ -406,13 +570,14 @@ class DocumentManager:
         try:
             # Check if already cached
             cache_key = f"content_{doc_id}"
-            if cache_key in self._document_cache:
-                self._update_access_time(cache_key)
-                return self._document_cache[cache_key].content
+            with self._cache_lock:
+                cached = self._document_cache.get(cache_key)
+                if cached is not None:
+                    self._update_access_time(cache_key)
+                    return cached.content
+                generation = self._cache_generation
             
-            conn = self._get_connection()
-            should_close = self.db_path != ':memory:'
-            try:
+            with self._read_connection() as conn:
                 cursor = conn.cursor()
                 
                 if use_streaming and self.is_large_document(doc_id):
@@ -423,7 +588,7 @@ class DocumentManager:
                     size_row = cursor.fetchone()
                     if size_row and size_row[0] > self._large_document_threshold * 2:
                         logger.info(f"Streaming large document {doc_id} ({size_row[0]} bytes)")
-                        return self._load_document_streaming(cursor, doc_id)
+                        return self._load_document_streaming(cursor, doc_id, generation)
                 
                 # Standard loading for normal-sized documents
                 cursor.execute('''
@@ -434,17 +599,14 @@ class DocumentManager:
                 if row:
                     content = row[0]
                     # Cache the content
-                    self._cache_document_content(doc_id, content)
+                    self._cache_document_content(doc_id, content, generation)
                     return content
                 return None
-            finally:
-                if should_close:
-                    conn.close()
         except sqlite3.Error as e:
             logger.error(f"Failed to load content for document {doc_id}: {e}")
             return None
     
-    def _load_document_streaming(self, cursor, doc_id: int) -> Optional[str]:
+    def _load_document_streaming(self, cursor, doc_id: int, generation: int) -> Optional[str]:
         """Load document content in chunks for very large documents"""
         try:
             cursor.execute('''
@@ -457,39 +619,41 @@ class DocumentManager:
                 # For streaming, we still load all content but with progress indication
                 # In a real streaming implementation, we'd load chunks progressively
                 logger.info(f"Loaded large document {doc_id} with streaming approach")
-                self._cache_document_content(doc_id, content)
+                self._cache_document_content(doc_id, content, generation)
                 return content
             return None
         except Exception as e:
             logger.error(f"Failed to stream document {doc_id}: {e}")
             return None
     
-    def _cache_document_content(self, doc_id: int, content: str):
-        """Cache document content with LRU management"""
-        from datetime import datetime
-        
+    def _cache_document_content(self, doc_id: int, content: str, generation: int):
+        """Cache document content with LRU management, unless it was read before an invalidation"""
         cache_key = f"content_{doc_id}"
         
         # Create a lightweight document object for caching
         class CachedDocument:
             def __init__(self, content):
                 self.content = content
-                self.cached_at = datetime.now()
-        
-        # If cache is full, remove LRU entries
-        if len(self._document_cache) >= self._cache_max_size:
-            self._evict_lru_documents()
+                self.cached_at = time.monotonic()
         
-        self._document_cache[cache_key] = CachedDocument(content)
-        self._update_access_time(cache_key)
+        with self._cache_lock:
+            if generation != self._cache_generation:
+                return
+            
+            # If cache is full, remove LRU entries
+            if len(self._document_cache) >= self._cache_max_size:
+                self._evict_lru_documents()
+            
+            self._document_cache[cache_key] = CachedDocument(content)
+            self._update_access_time(cache_key)
     
     def _update_access_time(self, cache_key: str):
         """Update access time for LRU tracking"""
-        from datetime import datetime
-        self._access_times[cache_key] = datetime.now()
+        with self._cache_lock:
+            self._access_times[cache_key] = time.monotonic()
     
     def _evict_lru_documents(self):
-        """Evict least recently used documents from cache"""
+        """Evict least recently used documents from cache (caller holds the cache lock)"""
         if not self._access_times:
             # Fallback to removing oldest entries
             entries_to_remove = max(1, self._cache_max_size // 4)
@@ -513,9 +677,7 @@ class DocumentManager:
     def is_large_document(self, doc_id: int) -> bool:
         """Check if document is considered large (for lazy loading)"""
         try:
-            conn = self._get_connection()
-            should_close = self.db_path != ':memory:'
-            try:
+            with self._read_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT LENGTH(content) FROM documents WHERE id = ?
@@ -525,34 +687,36 @@ class DocumentManager:
                 if row:
                     return row[0] > self._large_document_threshold
                 return False
-            finally:
-                if should_close:
-                    conn.close()
         except sqlite3.Error as e:
             logger.error(f"Failed to check document size {doc_id}: {e}")
             return False
     
-    def _cache_document(self, cache_key: str, document: Document):
-        """Cache document with size limit management"""
-        # If cache is full, remove oldest entries (LRU-style)
-        if len(self._document_cache) >= self._cache_max_size:
-            # Remove first (oldest) entry
-            oldest_key = next(iter(self._document_cache))
-            del self._document_cache[oldest_key]
-        
-        self._document_cache[cache_key] = document
+    def _cache_document(self, cache_key: str, document: Document, generation: int):
+        """Cache document with size limit management, unless it was read before an invalidation"""
+        with self._cache_lock:
+            if generation != self._cache_generation:
+                return
+            
+            # If cache is full, remove oldest entries (LRU-style)
+            if len(self._document_cache) >= self._cache_max_size:
+                # Remove first (oldest) entry
+                oldest_key = next(iter(self._document_cache))
+                del self._document_cache[oldest_key]
+            
+            self._document_cache[cache_key] = document
     
     def _cache_image(self, image_id: int, image_data: Tuple[str, bytes]):
         """Cache image with LRU management and size optimization"""
-        # If cache is full, remove LRU entries
-        if len(self._image_cache) >= self._image_cache_max_size:
-            self._evict_lru_images()
-        
-        self._image_cache[image_id] = image_data
-        self._update_access_time(f"image_{image_id}")
+        with self._cache_lock:
+            # If cache is full, remove LRU entries
+            if len(self._image_cache) >= self._image_cache_max_size:
+                self._evict_lru_images()
+            
+            self._image_cache[image_id] = image_data
+            self._update_access_time(f"image_{image_id}")
     
     def _evict_lru_images(self):
-        """Evict least recently used images from cache"""
+        """Evict least recently used images from cache (caller holds the cache lock)"""
         # Find image cache keys in access times
         image_access_times = {k: v for k, v in self._access_times.items() if k.startswith('image_')}
         
@@ -576,73 +740,96 @@ class DocumentManager:
         logger.info(f"Evicted {entries_to_remove} LRU images from cache")
     
     def _invalidate_document_cache(self, doc_id: int):
-        """Invalidate cached document data"""
-        keys_to_remove = [key for key in self._document_cache.keys() if key.startswith(f"{doc_id}_")]
-        for key in keys_to_remove:
-            del self._document_cache[key]
-        
-        # Also remove from metadata cache
-        if doc_id in self._metadata_cache:
-            del self._metadata_cache[doc_id]
+        """Invalidate cached document data (called after the change is committed)"""
+        with self._cache_lock:
+            # Reads that started before the commit must not re-cache the old row
+            self._cache_generation += 1
+            
+            prefix = f"{doc_id}_"
+            keys_to_remove = [key for key in self._document_cache if key.startswith(prefix)]
+            keys_to_remove.append(f"content_{doc_id}")
+            for key in keys_to_remove:
+                self._document_cache.pop(key, None)
+                self._access_times.pop(key, None)
+            
+            # Also remove from metadata cache
+            self._metadata_cache.pop(doc_id, None)
     
     def get_cache_stats(self) -> Dict[str, int]:
         """Get cache statistics for monitoring"""
-        return {
-            "document_cache_size": len(self._document_cache),
-            "image_cache_size": len(self._image_cache),
-            "metadata_cache_size": len(self._metadata_cache),
-            "document_cache_max": self._cache_max_size,
-            "image_cache_max": self._image_cache_max_size
-        }
+        with self._cache_lock:
+            return {
+                "document_cache_size": len(self._document_cache),
+                "image_cache_size": len(self._image_cache),
+                "metadata_cache_size": len(self._metadata_cache),
+                "document_cache_max": self._cache_max_size,
+                "image_cache_max": self._image_cache_max_size
+            }
     
     def optimize_caches(self):
         """Optimize caches using LRU eviction and memory management"""
-        # Optimize document cache if over 80% full
-        if len(self._document_cache) > self._cache_max_size * 0.8:
-            self._evict_lru_documents()
-            logger.info("Optimized document cache using LRU eviction")
-        
-        # Optimize image cache if over 80% full
-        if len(self._image_cache) > self._image_cache_max_size * 0.8:
-            self._evict_lru_images()
-            logger.info("Optimized image cache using LRU eviction")
-        
-        # Clean up orphaned access times
-        self._cleanup_access_times()
+        with self._cache_lock:
+            # Optimize document cache if over 80% full
+            if len(self._document_cache) > self._cache_max_size * 0.8:
+                self._evict_lru_documents()
+                logger.info("Optimized document cache using LRU eviction")
+            
+            # Optimize image cache if over 80% full
+            if len(self._image_cache) > self._image_cache_max_size * 0.8:
+                self._evict_lru_images()
+                logger.info("Optimized image cache using LRU eviction")
+            
+            # Clean up orphaned access times
+            self._cleanup_access_times()
     
     def _cleanup_access_times(self):
         """Clean up orphaned access time entries"""
-        valid_keys = set()
-        
-        # Add valid document cache keys
-        for key in self._document_cache.keys():
-            valid_keys.add(key)
-        
-        # Add valid image cache keys
-        for image_id in self._image_cache.keys():
-            valid_keys.add(f"image_{image_id}")
-        
-        # Remove orphaned access times
-        orphaned_keys = set(self._access_times.keys()) - valid_keys
-        for key in orphaned_keys:
-            del self._access_times[key]
+        with self._cache_lock:
+            valid_keys = set(self._document_cache)
+            
+            # Add valid image cache keys
+            for image_id in self._image_cache:
+                valid_keys.add(f"image_{image_id}")
+            
+            # Remove orphaned access times
+            orphaned_keys = set(self._access_times) - valid_keys
+            for key in orphaned_keys:
+                del self._access_times[key]
         
         if orphaned_keys:
             logger.info(f"Cleaned up {len(orphaned_keys)} orphaned access time entries")
     
     def clear_caches(self):
         """Clear all caches and access tracking"""
-        self._document_cache.clear()
-        self._image_cache.clear()
-        self._metadata_cache.clear()
-        self._preload_cache.clear()
-        self._access_times.clear()
+        with self._cache_lock:
+            self._cache_generation += 1
+            self._document_cache.clear()
+            self._image_cache.clear()
+            self._metadata_cache.clear()
+            self._preload_cache.clear()
+            self._access_times.clear()
         logger.info("Cleared all caches and access tracking data")
     
-    def search_documents(self, query: str, case_sensitive: bool = False) -> List[Dict]:
+    def close(self):
+        """Close pooled readers and the writer so the last close checkpoints the WAL"""
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+    
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+    
+    def search_documents(self, query: str, case_sensitive: bool = False) -> List[SearchHit]:
         """
         Search all documents for the given query string.
-        Returns a list of dictionaries with document info and match context.
+        Returns a list of SearchHit objects with document info and match context.
         """
         try:
             if not query.strip():
@@ -650,50 +837,44 @@ class DocumentManager:
             
             results = []
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._read_connection() as conn:
                 cursor = conn.cursor()
                 
                 # Search in both title and content
                 if case_sensitive:
+                    # instr() is an exact byte comparison, so only real matches come back
                     cursor.execute('''
                         SELECT id, title, content, updated_at
                         FROM documents
-                        WHERE title LIKE ? OR content LIKE ?
+                        WHERE instr(title, ?) > 0 OR instr(content, ?) > 0
                         ORDER BY updated_at DESC
-                    ''', (f'%{query}%', f'%{query}%'))
+                    ''', (query, query))
                 else:
-                    # Case-insensitive search
+                    # LIKE already ignores ASCII case, so no lowered copies are needed;
+                    # escape wildcards so '%' and '_' in the query match literally
+                    pattern = '%' + _LIKE_SPECIAL_RE.sub(r'\\\g<0>', query) + '%'
                     cursor.execute('''
                         SELECT id, title, content, updated_at
                         FROM documents
-                        WHERE LOWER(title) LIKE LOWER(?) OR LOWER(content) LIKE LOWER(?)
+                        WHERE title LIKE ? ESCAPE '\\' OR content LIKE ? ESCAPE '\\'
                         ORDER BY updated_at DESC
-                    ''', (f'%{query}%', f'%{query}%'))
+                    ''', (pattern, pattern))
+                
+                # One compiled matcher for every row instead of lowering each document
+                matcher = re.compile(re.escape(query), 0 if case_sensitive else re.IGNORECASE)
                 
                 for row in cursor.fetchall():
                     doc_id, title, content, updated_at = row
                     
                     # Find matches in title
-                    title_matches = []
-                    if case_sensitive:
-                        if query in title:
-                            title_matches.append(title)
-                    else:
-                        if query.lower() in title.lower():
-                            title_matches.append(title)
+                    title_matches = matcher.search(title) is not None
                     
                     # Find matches in content with context
-                    content_matches = self._extract_match_contexts(content, query, case_sensitive)
+                    content_matches = self._extract_match_contexts(content, matcher)
                     
                     if title_matches or content_matches:
-                        results.append({
-                            'id': doc_id,
-                            'title': title,
-                            'updated_at': updated_at,
-                            'title_matches': title_matches,
-                            'content_matches': content_matches,
-                            'match_count': len(title_matches) + len(content_matches)
-                        })
+                        results.append(SearchHit(doc_id, title, updated_at,
+                                                 title_matches, content_matches))
             
             logger.info(f"Search for '{query}' found {len(results)} documents")
             return results
@@ -702,27 +883,24 @@ class DocumentManager:
             logger.error(f"Search failed: {e}")
             return []
     
-    def _extract_match_contexts(self, content: str, query: str, case_sensitive: bool = False, 
+    def _extract_match_contexts(self, content: str, matcher: re.Pattern,
                                 context_chars: int = 50, max_matches: int = 5) -> List[str]:
         """
         Extract context around matches in content.
         Returns a list of strings showing the query in context.
         """
         matches = []
-        search_content = content if case_sensitive else content.lower()
-        search_query = query if case_sensitive else query.lower()
         
-        start_pos = 0
-        while len(matches) < max_matches:
-            pos = search_content.find(search_query, start_pos)
-            if pos == -1:
+        # finditer scans lazily, so the loop stops after max_matches hits
+        for match in matcher.finditer(content):
+            if len(matches) >= max_matches:
                 break
             
             # Extract context around the match
-            context_start = max(0, pos - context_chars)
-            context_end = min(len(content), pos + len(query) + context_chars)
+            context_start = max(0, match.start() - context_chars)
+            context_end = min(len(content), match.end() + context_chars)
             
-            # Get the context with the actual content (not lowercased)
+            # Get the context from the original content
             context = content[context_start:context_end]
             
             # Add ellipsis if not at start/end
@@ -735,6 +913,5 @@ class DocumentManager:
             context = ' '.join(context.split())
             
             matches.append(context)
-            start_pos = pos + len(query)
         
         return matches
\ No newline at end of file
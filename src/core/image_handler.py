@@ -5,7 +5,7 @@ Image Handler - Manages image pasting and storage functionality
 import uuid
 import logging
 from io import BytesIO
-from PySide6.QtGui import QClipboard, QPixmap
+from PySide6.QtGui import QClipboard, QImage
 from PySide6.QtCore import QObject, Signal
 from PySide6.QtWidgets import QApplication
 from .document_manager import DocumentManager
@@ -16,12 +16,16 @@ logger = logging.getLogger(__name__)
 class ImageHandler(QObject):
     image_pasted = Signal(str)  # Emits markdown syntax for pasted image
     
-    def __init__(self, document_manager: DocumentManager):
+    def __init__(self, document_manager: DocumentManager, max_dim: int = 1024):
         super().__init__()
         self.document_manager = document_manager
         self.current_document_id = None
         self._compression_quality = 85  # JPEG compression quality for optimization
-        self._max_image_size = (1920, 1080)  # Max dimensions for optimization
+        self._png_quality = 80  # Qt maps this to zlib level 1: fastest deflate, slightly larger files
+        self._max_dim = max_dim  # Longest edge after downscaling, None keeps the original size
+        self._clipboard_image = None  # Last image read from the clipboard, reused until it changes
+        self._clipboard_watched = False
+        self._last_encoded = None  # (QImage.cacheKey(), format, bytes) of the last stored image
     
     def set_current_document(self, doc_id: int):
         """Set the current document ID for image associations"""
@@ -31,15 +35,10 @@ class ImageHandler(QObject):
         """Handle paste operation, return True if image was pasted"""
         try:
             print("ImageHandler: handle_paste() called")
-            clipboard = QApplication.clipboard()
-            
-            print(f"ImageHandler: Checking clipboard, hasImage: {clipboard.mimeData().hasImage()}")
-            if clipboard.mimeData().hasImage():
-                pixmap = clipboard.pixmap()
-                print(f"ImageHandler: Got pixmap, isNull: {pixmap.isNull()}")
-                if not pixmap.isNull():
-                    self._store_and_insert_image(pixmap)
-                    return True
+            image = self.grab_clipboard_image()
+            if not image.isNull():
+                self._store_and_insert_image(image)
+                return True
             
             print("ImageHandler: No image found in clipboard")
             return False
@@ -48,7 +47,43 @@ class ImageHandler(QObject):
             logger.error(f"Failed to handle paste operation: {e}")
             return False
     
-    def _store_and_insert_image(self, pixmap: QPixmap):
+    def grab_clipboard_image(self) -> QImage:
+        """Read the clipboard image (GUI thread only), null QImage if none"""
+        clipboard = QApplication.clipboard()
+        if not self._clipboard_watched:
+            clipboard.dataChanged.connect(self._on_clipboard_changed)
+            self._clipboard_watched = True
+        
+        # Pasting the same clipboard again returns the same QImage (and cacheKey),
+        # so neither the clipboard decode nor the encode below is repeated
+        if self._clipboard_image is not None:
+            return self._clipboard_image
+        
+        print(f"ImageHandler: Checking clipboard, hasImage: {clipboard.mimeData().hasImage()}")
+        if clipboard.mimeData().hasImage():
+            image = clipboard.image()
+            print(f"ImageHandler: Got image, isNull: {image.isNull()}")
+            if not image.isNull():
+                self._clipboard_image = image
+            return image
+        return QImage()
+    
+    def _on_clipboard_changed(self):
+        """Forget the cached clipboard image once the clipboard holds something else"""
+        self._clipboard_image = None
+    
+    def insert_image(self, image: QImage) -> bool:
+        """Store and insert an already grabbed image, safe to call from a worker thread"""
+        try:
+            if image.isNull():
+                return False
+            self._store_and_insert_image(image)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to insert image: {e}")
+            return False
+    
+    def _store_and_insert_image(self, image: QImage):
         """Store optimized image in database and emit markdown syntax"""
         try:
             print(f"ImageHandler: _store_and_insert_image called, current_document_id: {self.current_document_id}")
@@ -57,29 +92,15 @@ class ImageHandler(QObject):
                 logger.warning("No current document set for image storage")
                 return
             
-            # Optimize image size and quality for better performance
-            optimized_pixmap = self._optimize_image(pixmap)
-            
-            # Convert pixmap to bytes with optimized format
-            from PySide6.QtCore import QBuffer, QIODevice
-            buffer = QBuffer()
-            buffer.open(QIODevice.WriteOnly)
-            
-            # Use JPEG for photos (better compression) or PNG for graphics
-            format_type = self._determine_optimal_format(optimized_pixmap)
-            print(f"ImageHandler: Converting pixmap to {format_type} bytes")
-            
-            if format_type == 'JPEG':
-                if not optimized_pixmap.save(buffer, 'JPEG', self._compression_quality):
-                    raise RuntimeError("Failed to convert image to JPEG format")
+            # Reuse the bytes when the same image data is stored again (e.g. repeated pastes)
+            cache_key = image.cacheKey()
+            cached = self._last_encoded
+            if cached is not None and cached[0] == cache_key:
+                _, format_type, image_data = cached
+                logger.debug("Reusing %d encoded bytes for a repeated image", len(image_data))
             else:
-                if not optimized_pixmap.save(buffer, 'PNG'):
-                    raise RuntimeError("Failed to convert image to PNG format")
-            
-            image_data = buffer.data().data()
-            print(f"ImageHandler: Converted to {len(image_data)} bytes (optimized from {pixmap.width()}x{pixmap.height()} to {optimized_pixmap.width()}x{optimized_pixmap.height()})")
-            if not image_data:
-                raise RuntimeError("Image data is empty")
+                format_type, image_data = self._encode_image(image)
+                self._last_encoded = (cache_key, format_type, image_data)
             
             # Generate unique filename with appropriate extension
             extension = 'jpg' if format_type == 'JPEG' else 'png'
@@ -106,41 +127,66 @@ class ImageHandler(QObject):
             logger.error(f"Failed to store and insert image: {e}")
             raise
     
-    def _optimize_image(self, pixmap: QPixmap) -> QPixmap:
+    def _encode_image(self, image: QImage) -> tuple:
+        """Downscale and encode an image, returning (format, bytes)"""
+        # Optimize image size and quality for better performance
+        optimized_image = self._optimize_image(image)
+        
+        # Encode straight into memory; reserve the raw 32-bit size up front so
+        # the encoder never has to grow and copy the array
+        from PySide6.QtCore import QBuffer, QByteArray, QIODevice
+        encoded = QByteArray()
+        encoded.reserve(optimized_image.width() * optimized_image.height() * 4)
+        buffer = QBuffer(encoded)
+        buffer.open(QIODevice.WriteOnly)
+        
+        # Use JPEG for photos (better compression) or PNG for graphics
+        format_type = self._determine_optimal_format(optimized_image)
+        print(f"ImageHandler: Converting image to {format_type} bytes")
+        
+        if format_type == 'JPEG':
+            if not optimized_image.save(buffer, 'JPEG', self._compression_quality):
+                raise RuntimeError("Failed to convert image to JPEG format")
+        else:
+            if not optimized_image.save(buffer, 'PNG', self._png_quality):
+                raise RuntimeError("Failed to convert image to PNG format")
+        
+        image_data = buffer.data().data()
+        print(f"ImageHandler: Converted to {len(image_data)} bytes (optimized from {image.width()}x{image.height()} to {optimized_image.width()}x{optimized_image.height()})")
+        if not image_data:
+            raise RuntimeError("Image data is empty")
+        return format_type, image_data
+    
+    def _optimize_image(self, image: QImage) -> QImage:
         """Optimize image size and quality for better performance"""
         try:
             # Check if image needs resizing
-            if (pixmap.width() > self._max_image_size[0] or 
-                pixmap.height() > self._max_image_size[1]):
+            if self._max_dim and max(image.width(), image.height()) > self._max_dim:
                 
                 # Calculate scaling to maintain aspect ratio
                 from PySide6.QtCore import Qt
-                scaled_pixmap = pixmap.scaled(
-                    self._max_image_size[0], 
-                    self._max_image_size[1], 
+                scaled_image = image.scaled(
+                    self._max_dim, 
+                    self._max_dim, 
                     Qt.KeepAspectRatio, 
                     Qt.SmoothTransformation
                 )
-                logger.info(f"Resized image from {pixmap.width()}x{pixmap.height()} to {scaled_pixmap.width()}x{scaled_pixmap.height()}")
-                return scaled_pixmap
+                logger.info(f"Resized image from {image.width()}x{image.height()} to {scaled_image.width()}x{scaled_image.height()}")
+                return scaled_image
             
-            return pixmap
+            return image
         except Exception as e:
             logger.error(f"Failed to optimize image: {e}")
-            return pixmap  # Return original if optimization fails
+            return image  # Return original if optimization fails
     
-    def _determine_optimal_format(self, pixmap: QPixmap) -> str:
+    def _determine_optimal_format(self, image: QImage) -> str:
         """Determine optimal image format based on content"""
         try:
-            # Simple heuristic: use JPEG for larger images (likely photos)
-            # and PNG for smaller images (likely graphics/screenshots)
-            pixel_count = pixmap.width() * pixmap.height()
-            
-            # If image is large (> 500K pixels), use JPEG for better compression
-            if pixel_count > 500000:
-                return 'JPEG'
-            else:
+            # JPEG cannot carry transparency, so keep PNG whenever there is an alpha channel
+            if image.hasAlphaChannel():
                 return 'PNG'
+            else:
+                return 'JPEG'
         except Exception as e:
             logger.error(f"Failed to determine optimal format: {e}")
             return 'PNG'  # Default to PNG
@@ -165,5 +211,5 @@ class ImageHandler(QObject):
             "image_cache_size": cache_stats.get("image_cache_size", 0),
             "image_cache_max": cache_stats.get("image_cache_max", 0),
             "compression_quality": self._compression_quality,
-            "max_image_size": self._max_image_size
+            "max_image_dim": self._max_dim
         }
\ No newline at end of file
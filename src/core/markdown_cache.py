@@ -0,0 +1,111 @@
+"""
+Markdown Cache - Persists rendered markdown HTML on disk, keyed by content hash
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "markdown-editor", "preview")
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+_PRUNE_EVERY_WRITES = 50  # Re-check the size budget after this many new entries
+
+
+class MarkdownCache:
+    """Content-addressed HTML cache shared across runs"""
+    
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+    
+    def key(self, content: str, variant: str) -> str:
+        """Get the cache file name for markdown content rendered by a given parser variant"""
+        # Converters are deterministic, so the content hash fully identifies the
+        # output; the variant keeps different parsers' HTML apart
+        digest = hashlib.blake2b(content.encode('utf-8'), digest_size=16, person=variant.encode()[:16])
+        return digest.hexdigest() + ".html"
+    
+    def get(self, key: str) -> Optional[str]:
+        """Read cached HTML for a key, or None on a miss"""
+        path = os.path.join(self.cache_dir, key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                html = f.read()
+            os.utime(path)  # Mark as recently used for pruning
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return html
+    
+    def put(self, key: str, html: str):
+        """Write rendered HTML atomically"""
+        path = os.path.join(self.cache_dir, key)
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # A unique temp file per writer, so concurrent writers (render worker,
+            # GUI thread, another app instance) never truncate each other's file
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with open(fd, 'w', encoding='utf-8') as f:
+                f.write(html)
+            os.replace(tmp_path, path)
+            tmp_path = None
+            self.writes += 1
+            if self.writes % _PRUNE_EVERY_WRITES == 0:
+                self.prune()
+        except OSError as e:
+            logger.debug("Could not write markdown cache %s: %s", key, e)
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+    
+    def render(self, content: str, variant: str, convert: Callable[[str], str]) -> str:
+        """Return cached HTML for content, converting and storing it on a miss"""
+        key = self.key(content, variant)
+        html = self.get(key)
+        if html is None:
+            html = convert(content)
+            self.put(key, html)
+        return html
+    
+    def prune(self):
+        """Drop least recently used files until the cache fits its size budget"""
+        try:
+            entries = []
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+        
+        total_size = sum(size for _, size, _ in entries)
+        entries.sort()  # Oldest first
+        for _, size, path in entries:
+            if total_size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total_size -= size
+            except OSError:
+                pass
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get hit/miss counters for this process"""
+        return {
+            "disk_cache_hits": self.hits,
+            "disk_cache_misses": self.misses,
+            "disk_cache_writes": self.writes,
+        }
@@ -6,16 +6,25 @@ import json
 import os
 import logging
 from typing import Optional, Dict, Any
-from PySide6.QtCore import QSettings
+from PySide6.QtCore import QSettings, QByteArray
 
 logger = logging.getLogger(__name__)
 
 
 class SettingsManager:
-    def __init__(self, settings_file: str = "settings.json"):
+    def __init__(self, settings_file: str = "settings.json", defer_writes: bool = False):
         self.settings_file = settings_file
         self.qt_settings = QSettings("MarkdownEditor", "MarkdownEditor")
         self._settings = self._load_settings()
+        
+        # With deferred writes, setters only mark settings dirty until sync()
+        self._defer_writes = defer_writes
+        self._dirty = False
+        self._dirty_callback = None
+    
+    def set_dirty_callback(self, callback):
+        """Set a callable invoked whenever a deferred change is recorded"""
+        self._dirty_callback = callback
     
     def _load_settings(self) -> Dict[str, Any]:
         """Load settings from file"""
@@ -42,7 +51,23 @@ class SettingsManager:
         }
     
     def _save_settings(self):
-        """Save settings to file"""
+        """Save settings to file, or mark them dirty when writes are deferred"""
+        if self._defer_writes:
+            self._dirty = True
+            if self._dirty_callback:
+                self._dirty_callback()
+            return
+        self._write_settings()
+    
+    def sync(self):
+        """Write pending settings changes to file"""
+        if self._dirty:
+            self._write_settings()
+        self.qt_settings.sync()
+    
+    def _write_settings(self):
+        """Write settings to file"""
+        self._dirty = False
         try:
             with open(self.settings_file, 'w') as f:
                 json.dump(self._settings, f, indent=2)
@@ -59,17 +84,29 @@ class SettingsManager:
         self._settings["last_document_id"] = doc_id
         self._save_settings()
     
-    def get_window_geometry(self) -> Optional[bytes]:
+    def get_window_geometry(self) -> Optional[QByteArray]:
         """Get saved window geometry"""
+        geometry = self.qt_settings.value("window/geometry")
+        if geometry:
+            return geometry
+        
+        # Fall back to geometry saved by older versions in settings.json
         geometry_data = self._settings.get("window_geometry")
         if geometry_data:
-            return bytes.fromhex(geometry_data)
+            return QByteArray(bytes.fromhex(geometry_data))
         return None
     
-    def set_window_geometry(self, geometry: bytes):
+    def set_window_geometry(self, geometry: QByteArray):
         """Save window geometry"""
-        self._settings["window_geometry"] = geometry.hex()
-        self._save_settings()
+        self.qt_settings.setValue("window/geometry", geometry)
+    
+    def get_window_state(self) -> Optional[QByteArray]:
+        """Get saved toolbar/dock layout"""
+        return self.qt_settings.value("window/state") or None
+    
+    def set_window_state(self, state: QByteArray):
+        """Save toolbar/dock layout"""
+        self.qt_settings.setValue("window/state", state)
     
     def get_splitter_sizes(self) -> Optional[list]:
         """Get saved splitter sizes"""
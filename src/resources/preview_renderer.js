@@ -33,6 +33,23 @@ class MarkdownPreviewRenderer {
         
         // Setup message handler for Python communication
         this.setupMessageHandler();
+        this.setupWebChannel();
+    }
+    
+    setupWebChannel() {
+        // Receive content from Python over QWebChannel
+        if (typeof QWebChannel === 'undefined' || typeof qt === 'undefined' || !qt.webChannelTransport) {
+            console.error('Qt WebChannel not available');
+            return;
+        }
+        
+        new QWebChannel(qt.webChannelTransport, (channel) => {
+            const bridge = channel.objects.py_bridge;
+            bridge.contentChanged.connect((markdown) => this.updateContent(markdown));
+            
+            // Let Python flush anything queued before the channel was up
+            bridge.ready();
+        });
     }
     
     setupMessageHandler() {
@@ -124,9 +141,6 @@ class MarkdownPreviewRenderer {
         this.currentTheme = themeName;
         document.body.className = `theme-${themeName}`;
         
-        // Clear cache when theme changes
-        this.contentCache.clear();
-        
         // Notify Python that theme changed
         this.sendMessage({ action: 'themeChanged', theme: themeName });
     }
@@ -158,7 +172,7 @@ class MarkdownPreviewRenderer {
     generateCacheKey(markdown) {
         // Simple hash function for cache key
         let hash = 0;
-        const str = markdown + this.currentTheme;
+        const str = markdown;
         for (let i = 0; i < str.length; i++) {
             const char = str.charCodeAt(i);
             hash = ((hash << 5) - hash) + char;
@@ -2,6 +2,7 @@
 Editor Widget - Markdown text editor with syntax highlighting
 """
 
+import re
 from PySide6.QtWidgets import QTextEdit, QWidget, QVBoxLayout, QHBoxLayout, QApplication
 from PySide6.QtCore import Signal, QTimer, Qt
 from PySide6.QtGui import QKeyEvent, QFont, QPainter, QColor, QTextCursor
@@ -391,39 +392,33 @@ class EditorWidget(QWidget):
     
     def scroll_to_heading(self, heading_text: str):
         """Scroll to a specific heading in the editor"""
-        import re
-        
         # Get the full text
         content = self.text_edit.toPlainText()
         
-        # Find all headings with their positions
-        pattern = r'^(#{1,6})\s+(.+)$'
-        
         cursor = self.text_edit.textCursor()
         cursor.movePosition(QTextCursor.Start)
         
-        # Search for the heading
-        for match in re.finditer(pattern, content, re.MULTILINE):
-            heading = match.group(2).strip()
-            if heading == heading_text:
-                # Found the heading, move cursor to it
-                position = match.start()
-                cursor.setPosition(position)
-                
-                # Move cursor to the beginning of the line
-                cursor.movePosition(QTextCursor.StartOfLine)
-                
-                # Set the cursor position first
-                self.text_edit.setTextCursor(cursor)
-                
-                # Ensure cursor is visible and centered
-                self.text_edit.ensureCursorVisible()
-                
-                # Select the entire line for visual feedback
-                cursor.select(QTextCursor.LineUnderCursor)
-                self.text_edit.setTextCursor(cursor)
-                
-                # Set focus to the editor so the selection is visible
-                self.text_edit.setFocus()
-                
-                break
\ No newline at end of file
+        # Search for this heading directly: one scan in C that stops at the
+        # first hit, instead of a Python-level loop over every heading
+        pattern = r'^#{1,6}\s+' + re.escape(heading_text.strip()) + r'[ \t\r\f\v]*$'
+        match = re.search(pattern, content, re.MULTILINE)
+        if match:
+            # Found the heading, move cursor to it
+            position = match.start()
+            cursor.setPosition(position)
+            
+            # Move cursor to the beginning of the line
+            cursor.movePosition(QTextCursor.StartOfLine)
+            
+            # Set the cursor position first
+            self.text_edit.setTextCursor(cursor)
+            
+            # Ensure cursor is visible and centered
+            self.text_edit.ensureCursorVisible()
+            
+            # Select the entire line for visual feedback
+            cursor.select(QTextCursor.LineUnderCursor)
+            self.text_edit.setTextCursor(cursor)
+            
+            # Set focus to the editor so the selection is visible
+            self.text_edit.setFocus()
\ No newline at end of file
@@ -2,10 +2,16 @@
 Main Window - Primary application window managing the three-pane layout
 """
 
+import gc
+import os
+import time
+import logging
+from functools import lru_cache
+
 from PySide6.QtWidgets import (QMainWindow, QWidget, QHBoxLayout, QSplitter, 
                                QMenuBar, QToolBar, QStatusBar, QMessageBox,
                                QApplication)
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QTimer, QSignalBlocker, QThreadPool, Signal
 from PySide6.QtGui import QAction, QIcon, QKeySequence, QActionGroup
 
 from .editor_widget import EditorWidget
@@ -18,12 +24,105 @@ from core.document_manager import DocumentManager
 from core.image_handler import ImageHandler
 from core.settings_manager import SettingsManager
 
+logger = logging.getLogger(__name__)
+
+try:
+    import psutil
+except ImportError:
+    psutil = None  # Memory monitoring is optional
+
+# Byte-size conversion factors (multiply instead of repeated division)
+_BYTES_PER_KB = 1.0 / 1024
+_BYTES_PER_MB = 1.0 / 1048576
+
+# Resident memory above which caches are trimmed
+_MEM_OPTIMIZE_MB = 500.0
+
+# Bounds for the adaptive cache-optimization interval
+_PERF_INTERVAL_MIN_MS = 30000
+_PERF_INTERVAL_MAX_MS = 600000
+
+# Growth over the last seen high-water mark that triggers a memory check
+_MEM_HWM_GROWTH = 1.1
+
+# Page size for reading /proc/self/statm (0 where unavailable)
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if os.path.exists("/proc/self/statm") else 0
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 0
+
+# Custom shortcuts, parsed once at import instead of on every menu build
+_KS_FIND_REPLACE = QKeySequence("Ctrl+H")
+_KS_SEARCH_ALL = QKeySequence("Ctrl+Shift+F")
+_KS_PASTE_IMAGE = QKeySequence("Ctrl+Shift+V")
+_KS_QUOTE = QKeySequence("Ctrl+Q")
+_KS_TABLE = QKeySequence("Ctrl+T")
+_KS_FOCUS_EDITOR = QKeySequence("Ctrl+E")
+_KS_LINE_NUMBERS = QKeySequence("Ctrl+L")
+_KS_ZOOM_IN = QKeySequence("Ctrl+=")
+_KS_ZOOM_OUT = QKeySequence("Ctrl+_")
+_KS_ZOOM_RESET = QKeySequence("Ctrl+0")
+_KS_HELP = QKeySequence("F1")
+
+
+@lru_cache(maxsize=32)
+def _pretty_theme(name: str) -> str:
+    """Display name for a theme id, e.g. 'solarized_dark' -> 'Solarized Dark'"""
+    return name.replace('_', ' ').title()
+
 
 class MainWindow(QMainWindow):
+    # Emitted from the save worker; queued back to the UI thread
+    _auto_save_finished = Signal(bool)
+    
+    # Fixed layout of the performance statistics dialog
+    _STATS_TEMPLATE = """Performance Statistics:
+
+Document Cache:
+- Size: {document_cache_size}/{document_cache_max}
+- Metadata Cache: {metadata_cache_size} items
+
+Image Cache:
+- Size: {image_cache_size}/{image_cache_max}
+- Compression Quality: {compression_quality}%
+- Max Image Dimension: {max_image_dim}px
+
+HTML Preview Cache:
+- Size: {cache_size}/{cache_max_size}
+- Hit Rate: {hit_rate_percent}%
+- Hits: {cache_hits}, Misses: {cache_misses}
+
+Memory Usage:
+{memory_info}
+
+Performance Features:
+- Lazy loading for documents > 50KB
+- LRU cache eviction for optimal memory usage
+- Batched HTML rendering with 100ms debounce
+- Image compression for files > 100KB
+- CSS precompilation for themes
+"""
+
     def __init__(self):
         super().__init__()
         self.current_document_id = None
         self.search_dialog = None
+        self.hotkey_dialog = None
+        self._process = None
+        self._memory_monitoring = False  # Enabled once a memory baseline is taken
+        self._memory_hwm = 0
+        self._nav_status_cache = {}  # heading text -> navigation status message
+        self._last_status = ("", 0.0)  # (message, monotonic time) of last status shown
+        self._last_err_ts = 0.0  # monotonic time of the last error shown
+        self._edits_since_last_opt = 0  # Edits/loads since the last cache optimization
+        self._last_content_hash = None  # Hash of the content last pushed to preview/outline
+        
+        # Single worker so saves are written in the order they were taken.
+        # Created before documents load, since load_document waits on it
+        self._save_pool = QThreadPool(self)
+        self._save_pool.setMaxThreadCount(1)
+        self._auto_save_finished.connect(self._on_auto_save_finished)
+        
         self.setup_core_components()
         self.setup_ui()
         self.setup_connections()
@@ -38,13 +137,27 @@ class MainWindow(QMainWindow):
         
         # Setup performance optimization timer
         self.setup_performance_timer()
+        
+        # Build the search dialog at idle time instead of on first Ctrl+Shift+F
+        QTimer.singleShot(500, self._prewarm_search_dialog)
     
     def setup_core_components(self):
         """Initialize core components"""
         try:
             self.document_manager = DocumentManager()
             self.image_handler = ImageHandler(self.document_manager)
-            self.settings_manager = SettingsManager()
+            self.settings_manager = SettingsManager(defer_writes=True)
+            
+            # Coalesce settings writes: flush 1s after the last change and on quit
+            self._settings_flush_timer = QTimer(self)
+            self._settings_flush_timer.setSingleShot(True)
+            self._settings_flush_timer.setInterval(1000)
+            self._settings_flush_timer.setTimerType(Qt.CoarseTimer)
+            self._settings_flush_timer.timeout.connect(self.settings_manager.sync)
+            self.settings_manager.set_dirty_callback(self._settings_flush_timer.start)
+            QApplication.instance().aboutToQuit.connect(self.settings_manager.sync)
+            # Reuse one process handle for all memory queries
+            self._process = psutil.Process(os.getpid()) if psutil else None
         except Exception as e:
             QMessageBox.critical(self, "Initialization Error", 
                                f"Failed to initialize application components: {str(e)}")
@@ -115,29 +228,24 @@ class MainWindow(QMainWindow):
         # Edit menu
         edit_menu = menubar.addMenu("Edit")
         
-        # Find and Replace
-        find_action = QAction("Find...", self)
-        find_action.setShortcut(QKeySequence.Find)
+        # Find and Replace (Ctrl+F and Ctrl+H open the same dialog)
+        find_action = QAction("Find and Replace...", self)
+        find_action.setShortcuts([QKeySequence(QKeySequence.Find), _KS_FIND_REPLACE])
         find_action.triggered.connect(self.editor.show_find_replace)
         edit_menu.addAction(find_action)
         
-        find_replace_action = QAction("Find and Replace...", self)
-        find_replace_action.setShortcut(QKeySequence("Ctrl+H"))
-        find_replace_action.triggered.connect(self.editor.show_find_replace)
-        edit_menu.addAction(find_replace_action)
-        
         edit_menu.addSeparator()
         
         # Global search
         search_action = QAction("Search All Documents...", self)
-        search_action.setShortcut(QKeySequence("Ctrl+Shift+F"))
+        search_action.setShortcut(_KS_SEARCH_ALL)
         search_action.triggered.connect(self.show_search_dialog)
         edit_menu.addAction(search_action)
         
         edit_menu.addSeparator()
         
         paste_image_action = QAction("Paste Image", self)
-        paste_image_action.setShortcut(QKeySequence("Ctrl+Shift+V"))
+        paste_image_action.setShortcut(_KS_PASTE_IMAGE)
         paste_image_action.triggered.connect(self.paste_image)
         edit_menu.addAction(paste_image_action)
         
@@ -145,13 +253,13 @@ class MainWindow(QMainWindow):
         
         # Quote action
         quote_action = QAction("Toggle Quote", self)
-        quote_action.setShortcut(QKeySequence("Ctrl+Q"))
+        quote_action.setShortcut(_KS_QUOTE)
         quote_action.triggered.connect(self.editor.toggle_quote)
         edit_menu.addAction(quote_action)
         
         # Table insertion
         table_action = QAction("Insert Table", self)
-        table_action.setShortcut(QKeySequence("Ctrl+T"))
+        table_action.setShortcut(_KS_TABLE)
         table_action.triggered.connect(self.insert_table)
         edit_menu.addAction(table_action)
         
@@ -159,7 +267,7 @@ class MainWindow(QMainWindow):
         view_menu = menubar.addMenu("View")
         
         focus_editor_action = QAction("Focus Editor", self)
-        focus_editor_action.setShortcut(QKeySequence("Ctrl+E"))
+        focus_editor_action.setShortcut(_KS_FOCUS_EDITOR)
         focus_editor_action.triggered.connect(self.editor.focus)
         view_menu.addAction(focus_editor_action)
         
@@ -167,25 +275,25 @@ class MainWindow(QMainWindow):
         
         # Editor options
         toggle_line_numbers_action = QAction("Toggle Line Numbers", self)
-        toggle_line_numbers_action.setShortcut(QKeySequence("Ctrl+L"))
+        toggle_line_numbers_action.setShortcut(_KS_LINE_NUMBERS)
         toggle_line_numbers_action.triggered.connect(self.editor.toggle_line_numbers)
         view_menu.addAction(toggle_line_numbers_action)
         
         # Zoom actions
         zoom_in_action = QAction("Zoom In", self)
         # Use Ctrl+= to avoid conflict with direct key handler (Ctrl++ is handled there)
-        zoom_in_action.setShortcut(QKeySequence("Ctrl+="))
+        zoom_in_action.setShortcut(_KS_ZOOM_IN)
         zoom_in_action.triggered.connect(self.editor.zoom_in)
         view_menu.addAction(zoom_in_action)
         
         zoom_out_action = QAction("Zoom Out", self)
         # Use only underscore to avoid conflict with direct key handler
-        zoom_out_action.setShortcut(QKeySequence("Ctrl+_"))
+        zoom_out_action.setShortcut(_KS_ZOOM_OUT)
         zoom_out_action.triggered.connect(self.editor.zoom_out)
         view_menu.addAction(zoom_out_action)
         
         reset_zoom_action = QAction("Reset Zoom", self)
-        reset_zoom_action.setShortcut(QKeySequence("Ctrl+0"))
+        reset_zoom_action.setShortcut(_KS_ZOOM_RESET)
         reset_zoom_action.triggered.connect(self.editor.reset_zoom)
         view_menu.addAction(reset_zoom_action)
         
@@ -194,40 +302,24 @@ class MainWindow(QMainWindow):
         # Editor theme submenu
         editor_theme_menu = view_menu.addMenu("Editor Theme")
         
-        # Create editor theme actions
-        self.editor_theme_group = QActionGroup(self)
-        
-        for theme_name in self.editor.get_available_themes():
-            theme_action = QAction(theme_name.replace('_', ' ').title(), self)
-            theme_action.setCheckable(True)
-            theme_action.setData(theme_name)
-            theme_action.triggered.connect(lambda checked, name=theme_name: self.change_editor_theme(name))
-            self.editor_theme_group.addAction(theme_action)
-            editor_theme_menu.addAction(theme_action)
-            
-            # Set default theme as checked
-            if theme_name == self.editor.get_current_theme():
-                theme_action.setChecked(True)
+        self.editor_theme_group = self._populate_theme_menu(
+            editor_theme_menu,
+            self.editor.get_available_themes(),
+            self.editor.get_current_theme(),
+            _pretty_theme,
+            self.change_editor_theme)
         
         view_menu.addSeparator()
         
         # Preview theme submenu
         theme_menu = view_menu.addMenu("Preview Theme")
         
-        # Create theme actions
-        self.theme_group = QActionGroup(self)
-        
-        for theme_name in self.preview.get_available_themes():
-            theme_action = QAction(theme_name.title(), self)
-            theme_action.setCheckable(True)
-            theme_action.setData(theme_name)
-            theme_action.triggered.connect(lambda checked, name=theme_name: self.change_theme(name))
-            self.theme_group.addAction(theme_action)
-            theme_menu.addAction(theme_action)
-            
-            # Set default theme as checked
-            if theme_name == self.preview.get_current_theme():
-                theme_action.setChecked(True)
+        self.theme_group = self._populate_theme_menu(
+            theme_menu,
+            self.preview.get_available_themes(),
+            self.preview.get_current_theme(),
+            _pretty_theme,
+            self.change_theme)
         
         view_menu.addSeparator()
         
@@ -255,13 +347,35 @@ class MainWindow(QMainWindow):
         help_menu = menubar.addMenu("Help")
         
         hotkeys_action = QAction("Keyboard Shortcuts", self)
-        hotkeys_action.setShortcut(QKeySequence("F1"))
+        hotkeys_action.setShortcut(_KS_HELP)
         hotkeys_action.triggered.connect(self.show_hotkeys)
         help_menu.addAction(hotkeys_action)
     
+    def _populate_theme_menu(self, menu, themes, current, display_fn, on_trigger):
+        """Fill a theme submenu with checkable actions and return their group"""
+        group = QActionGroup(self)
+        actions = []
+        
+        for theme_name in themes:
+            theme_action = QAction(display_fn(theme_name), self)
+            theme_action.setCheckable(True)
+            theme_action.setData(theme_name)
+            group.addAction(theme_action)
+            actions.append(theme_action)
+            
+            # Set default theme as checked
+            if theme_name == current:
+                theme_action.setChecked(True)
+        
+        # One connection for the whole group; the theme name travels in action data
+        group.triggered.connect(lambda action: on_trigger(action.data()))
+        menu.addActions(actions)
+        return group
+    
     def setup_toolbar(self):
         """Setup the toolbar"""
         toolbar = QToolBar()
+        toolbar.setObjectName("mainToolbar")  # Needed for saveState/restoreState
         self.addToolBar(toolbar)
         
         # Bold button
@@ -355,7 +469,7 @@ class MainWindow(QMainWindow):
         try:
             # Load documents without content for sidebar display (performance optimization)
             documents = self.document_manager.get_all_documents(load_content=False)
-            self.sidebar.update_documents(documents)
+            self._update_sidebar_batched(self.sidebar.update_documents, documents)
             
             # Load first document if available
             if documents:
@@ -364,8 +478,20 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Error", f"Failed to load documents: {str(e)}")
             self.status_bar.showMessage("Failed to load documents")
     
+    def _update_sidebar_batched(self, update, *args):
+        """Run a bulk sidebar update with repaints and signals suspended"""
+        self.sidebar.setUpdatesEnabled(False)
+        self.sidebar.blockSignals(True)
+        try:
+            update(*args)
+        finally:
+            self.sidebar.blockSignals(False)
+            self.sidebar.setUpdatesEnabled(True)
+    
     def load_document(self, doc_id: int):
         """Load a specific document with enhanced lazy loading and progress indication"""
+        # A save still running on the worker must land before the document is read back
+        self._save_pool.waitForDone()
         try:
             # Check if document is large and use progressive loading
             if self.document_manager.is_large_document(doc_id):
@@ -375,7 +501,7 @@ class MainWindow(QMainWindow):
                 document = self.document_manager.get_document(doc_id, load_content=False)
                 if document:
                     # Show document info immediately
-                    size_kb = document.content_length / 1024
+                    size_kb = document.content_length * _BYTES_PER_KB
                     self.status_bar.showMessage(f"Loading: {document.title} ({size_kb:.1f} KB)...")
                     
                     # Process events to update UI
@@ -396,20 +522,24 @@ class MainWindow(QMainWindow):
             
             if document:
                 self.current_document_id = doc_id
+                self._nav_status_cache.clear()
                 
                 # Set content with progress indication for large documents
                 if document.content_length > 100000:  # 100KB threshold
                     self.status_bar.showMessage("Rendering content...")
                     QApplication.processEvents()
                 
+                self._last_content_hash = hash(document.content)
                 self.editor.set_content(document.content)
                 self.preview.update_content(document.content)
                 self.sidebar.update_outline(document.content)
                 self.image_handler.set_current_document(doc_id)
+                self._edits_since_last_opt += 1
+                self._maybe_check_memory()
                 
                 # Show final status with performance info
                 if document.content_length > 50000:
-                    size_kb = document.content_length / 1024
+                    size_kb = document.content_length * _BYTES_PER_KB
                     cache_stats = self.document_manager.get_cache_stats()
                     self.status_bar.showMessage(f"Loaded: {document.title} ({size_kb:.1f} KB) - Cache: {cache_stats['document_cache_size']}/{cache_stats['document_cache_max']}")
                 else:
@@ -445,9 +575,12 @@ class MainWindow(QMainWindow):
             # Clear editor if deleted document was current
             if self.current_document_id == doc_id:
                 self.current_document_id = None
-                self.editor.set_content("")
-                self.preview.update_content("")
-                self.sidebar.update_outline("")
+                # Skip the clears (and the preview re-render) if already empty
+                if self.editor.get_content():
+                    self._last_content_hash = hash("")
+                    self.editor.set_content("")
+                    self.preview.update_content("")
+                    self.sidebar.update_outline("")
                 self.settings_manager.set_last_document_id(None)
             
             # Remove from recent documents
@@ -471,6 +604,12 @@ class MainWindow(QMainWindow):
     
     def on_text_changed(self, content: str):
         """Handle text changes in editor"""
+        # The editor re-emits after programmatic loads; skip unchanged content
+        content_hash = hash(content)
+        if content_hash == self._last_content_hash:
+            return
+        self._last_content_hash = content_hash
+        
         # Update preview
         self.preview.update_content(content)
         self.sidebar.update_outline(content)
@@ -478,16 +617,31 @@ class MainWindow(QMainWindow):
         # Start auto-save timer
         if self.current_document_id:
             self.auto_save_timer.start()
+        
+        self._edits_since_last_opt += 1
+        self._maybe_check_memory()
     
     def auto_save(self):
         """Auto-save current document"""
         if self.current_document_id:
-            try:
-                content = self.editor.get_content()
-                self.document_manager.update_document(self.current_document_id, content=content)
-                self.status_bar.showMessage("Auto-saved", 2000)
-            except (RuntimeError, ValueError) as e:
-                self.status_bar.showMessage("Auto-save failed", 2000)
+            # Read the editor here; the database write happens on the save worker
+            content = self.editor.get_content()
+            doc_id = self.current_document_id
+            self._save_pool.start(
+                lambda: self._auto_save_finished.emit(self._write_document_content(doc_id, content)))
+    
+    def _on_auto_save_finished(self, success: bool):
+        """Report the result of a background auto-save"""
+        self.status_bar.showMessage("Auto-saved" if success else "Auto-save failed", 2000)
+    
+    def _write_document_content(self, doc_id: int, content: str) -> bool:
+        """Write document content without touching widgets (safe off the UI thread)"""
+        try:
+            self.document_manager.update_document(doc_id, content=content)
+            return True
+        except (RuntimeError, ValueError) as e:
+            logger.error(f"Auto-save failed: {e}")
+            return False
     
     def save_current_document(self):
         """Manually save current document"""
@@ -502,23 +656,23 @@ class MainWindow(QMainWindow):
     
     def paste_image(self):
         """Handle image pasting"""
-        print("MainWindow: paste_image() called")
+        logger.debug("paste_image() called")
         try:
             if self.current_document_id is None:
-                print("MainWindow: No current document selected")
+                logger.debug("No current document selected")
                 QMessageBox.warning(self, "Warning", "Please select a document first")
                 self.status_bar.showMessage("No document selected")
                 return
                 
-            print(f"MainWindow: Attempting to paste image for document {self.current_document_id}")
+            logger.debug("Attempting to paste image for document %s", self.current_document_id)
             if self.image_handler.handle_paste():
-                print("MainWindow: Image paste successful")
+                logger.debug("Image paste successful")
                 self.status_bar.showMessage("Image pasted", 2000)
             else:
-                print("MainWindow: No image in clipboard")
+                logger.debug("No image in clipboard")
                 self.status_bar.showMessage("No image in clipboard", 2000)
         except Exception as e:
-            print(f"MainWindow: Error pasting image: {e}")
+            logger.error(f"Error pasting image: {e}")
             QMessageBox.critical(self, "Error", f"Failed to paste image: {str(e)}")
             self.status_bar.showMessage("Failed to paste image")
     
@@ -541,6 +695,9 @@ class MainWindow(QMainWindow):
             geometry = self.settings_manager.get_window_geometry()
             if geometry:
                 self.restoreGeometry(geometry)
+            state = self.settings_manager.get_window_state()
+            if state:
+                self.restoreState(state)
             
             # Restore splitter sizes
             sizes = self.settings_manager.get_splitter_sizes()
@@ -551,21 +708,23 @@ class MainWindow(QMainWindow):
             saved_theme = self.settings_manager.get_preview_theme()
             self.preview.set_theme(saved_theme)
             
-            # Update theme menu selection
-            for action in self.theme_group.actions():
-                if action.data() == saved_theme:
-                    action.setChecked(True)
-                    break
+            # Update theme menu selection without re-running theme changes
+            with QSignalBlocker(self.theme_group):
+                for action in self.theme_group.actions():
+                    if action.data() == saved_theme:
+                        action.setChecked(True)
+                        break
             
             # Restore editor theme
             saved_editor_theme = self.settings_manager.get_editor_theme()
             self.editor.set_theme(saved_editor_theme)
             
-            # Update editor theme menu selection
-            for action in self.editor_theme_group.actions():
-                if action.data() == saved_editor_theme:
-                    action.setChecked(True)
-                    break
+            # Update editor theme menu selection without re-running theme changes
+            with QSignalBlocker(self.editor_theme_group):
+                for action in self.editor_theme_group.actions():
+                    if action.data() == saved_editor_theme:
+                        action.setChecked(True)
+                        break
             
             # Restore editor settings
             line_numbers_enabled = self.settings_manager.get_line_numbers_enabled()
@@ -597,8 +756,9 @@ class MainWindow(QMainWindow):
     def save_session_state(self):
         """Save current session state"""
         try:
-            # Save window geometry
+            # Save window geometry and toolbar layout
             self.settings_manager.set_window_geometry(self.saveGeometry())
+            self.settings_manager.set_window_state(self.saveState())
             
             # Save splitter sizes
             self.settings_manager.set_splitter_sizes(self.splitter.sizes())
@@ -622,8 +782,14 @@ class MainWindow(QMainWindow):
         except Exception as e:
             pass
     
-    def clear_caches(self):
+    def clear_caches(self, for_exit: bool = False):
         """Clear all performance caches"""
+        if for_exit:
+            # The process is going away and the OS reclaims the memory; just
+            # keep the collector from walking long-lived objects at shutdown
+            gc.freeze()
+            return
+        
         try:
             self.document_manager.clear_caches()
             self.preview.clear_cache()
@@ -654,32 +820,8 @@ class MainWindow(QMainWindow):
             # Get memory usage if available
             memory_info = self.get_memory_usage()
             
-            stats_message = f"""Performance Statistics:
-
-Document Cache:
-- Size: {doc_stats['document_cache_size']}/{doc_stats['document_cache_max']}
-- Metadata Cache: {doc_stats['metadata_cache_size']} items
-
-Image Cache:
-- Size: {image_stats['image_cache_size']}/{image_stats['image_cache_max']}
-- Compression Quality: {image_stats['compression_quality']}%
-- Max Image Size: {image_stats['max_image_size'][0]}x{image_stats['max_image_size'][1]}
-
-HTML Preview Cache:
-- Size: {preview_stats['cache_size']}/{preview_stats['cache_max_size']}
-- Hit Rate: {preview_stats['hit_rate_percent']}%
-- Hits: {preview_stats['cache_hits']}, Misses: {preview_stats['cache_misses']}
-
-Memory Usage:
-{memory_info}
-
-Performance Features:
-- Lazy loading for documents > 50KB
-- LRU cache eviction for optimal memory usage
-- Batched HTML rendering with 100ms debounce
-- Image compression for files > 100KB
-- CSS precompilation for themes
-"""
+            stats = {**doc_stats, **preview_stats, **image_stats, "memory_info": memory_info}
+            stats_message = self._STATS_TEMPLATE.format_map(stats)
             
             QMessageBox.information(self, "Performance Statistics", stats_message)
         except Exception as e:
@@ -687,51 +829,105 @@ Performance Features:
     
     def get_memory_usage(self) -> str:
         """Get current memory usage information"""
+        if self._process is None:
+            return "- Memory monitoring not available (install psutil)"
+        
         try:
-            import psutil
-            import os
-            
-            process = psutil.Process(os.getpid())
-            memory_info = process.memory_info()
-            memory_mb = memory_info.rss / 1024 / 1024
+            memory_info = self._process.memory_info()
+            memory_mb = memory_info.rss * _BYTES_PER_MB
             
             return f"- Current Usage: {memory_mb:.1f} MB"
-        except ImportError:
-            return "- Memory monitoring not available (install psutil)"
         except Exception as e:
             return f"- Memory info unavailable: {str(e)}"
     
-    def monitor_memory_usage(self):
+    def _current_rss(self):
+        """Get resident memory in bytes, or None if it cannot be read"""
+        if _PAGE_SIZE:
+            # Linux: one small read, no psutil involved
+            try:
+                with open("/proc/self/statm", "rb") as f:
+                    return int(f.read().split()[1]) * _PAGE_SIZE
+            except (OSError, ValueError, IndexError):
+                pass
+        
+        if self._process is not None:
+            try:
+                return self._process.memory_info().rss
+            except (psutil.Error, OSError):
+                # Handle is no longer usable; drop it rather than retrying
+                self._process = None
+        return None
+    
+    def _maybe_check_memory(self):
+        """Run the memory check only when memory has grown past the high-water mark"""
+        if not self._memory_monitoring:
+            return
+        
+        rss = self._current_rss()
+        if rss is None:
+            # Memory can't be read on this platform, stop checking
+            self._memory_monitoring = False
+            return
+        
+        if rss > self._memory_hwm * _MEM_HWM_GROWTH:
+            self._memory_hwm = rss
+            self.monitor_memory_usage(rss)
+    
+    def monitor_memory_usage(self, rss=None):
         """Monitor memory usage and optimize if needed"""
-        try:
-            import psutil
-            import os
-            
-            process = psutil.Process(os.getpid())
-            memory_info = process.memory_info()
-            memory_mb = memory_info.rss / 1024 / 1024
-            
-            # If memory usage is high (> 500MB), trigger optimization
-            if memory_mb > 500:
-                self.optimize_performance()
-                self.status_bar.showMessage(f"Memory optimized ({memory_mb:.1f} MB)", 3000)
-        except ImportError:
-            # psutil not available, disable memory monitoring
-            self.memory_timer.stop()
-        except Exception:
-            # Error in memory monitoring, continue silently
-            pass
+        if rss is None:
+            rss = self._current_rss()
+            if rss is None:
+                return
+        
+        memory_mb = rss * _BYTES_PER_MB
+        if memory_mb > _MEM_OPTIMIZE_MB:
+            self.optimize_performance()
+            self.status_bar.showMessage(f"Memory optimized ({memory_mb:.1f} MB)", 3000)
     
     def setup_performance_timer(self):
         """Setup timer for periodic performance optimization"""
-        self.performance_timer = QTimer()
-        self.performance_timer.timeout.connect(self.optimize_performance)
-        self.performance_timer.start(180000)  # Optimize every 3 minutes for better performance
-        
-        # Setup memory monitoring timer
-        self.memory_timer = QTimer()
-        self.memory_timer.timeout.connect(self.monitor_memory_usage)
-        self.memory_timer.start(60000)  # Check memory every minute
+        # Memory is checked on edits/loads against a high-water mark, not polled
+        baseline = self._current_rss()
+        self._memory_monitoring = baseline is not None
+        self._memory_hwm = baseline or 0
+        
+        # Minute-granularity housekeeping, so allow coarse wakeups
+        self.performance_timer = QTimer(self)
+        self.performance_timer.setSingleShot(False)
+        self.performance_timer.setTimerType(Qt.VeryCoarseTimer)
+        self.performance_timer.timeout.connect(self._on_performance_tick)
+        self.performance_timer.start(60000)  # Adapts between 30s and 10min
+    
+    def _on_performance_tick(self):
+        """Optimize caches, backing off while idle and tightening while editing"""
+        interval = self.performance_timer.interval()
+        if self._edits_since_last_opt == 0:
+            # Nothing changed since the last run, so there is nothing to trim
+            self.performance_timer.setInterval(min(_PERF_INTERVAL_MAX_MS, interval * 2))
+            return
+        
+        self.optimize_performance()
+        self.performance_timer.setInterval(max(_PERF_INTERVAL_MIN_MS, interval // 2))
+        self._edits_since_last_opt = 0
+    
+    def _status_ok(self, message: str, timeout: int = 2000):
+        """Show a status message, skipping repeats of the same message within 250ms"""
+        now = time.monotonic()
+        last_message, last_time = self._last_status
+        if message == last_message and now - last_time < 0.25:
+            return
+        self._last_status = (message, now)
+        self.status_bar.showMessage(message, timeout)
+    
+    def _status_err(self, prefix: str, exc: Exception):
+        """Log a failure and show it, unless another error was shown within 500ms"""
+        logger.error(f"{prefix}: {exc}")
+        now = time.monotonic()
+        if now - self._last_err_ts < 0.5:
+            return
+        self._last_err_ts = now
+        self.status_bar.showMessage(f"{prefix}: {exc}", 3000)
     
     def change_theme(self, theme_name: str):
         """Change the preview theme"""
@@ -739,9 +935,10 @@ Performance Features:
             self.preview.set_theme(theme_name)
             # Save theme preference
             self.settings_manager.set_preview_theme(theme_name)
-            self.status_bar.showMessage(f"Preview theme changed to {theme_name.title()}", 2000)
-        except Exception as e:
-            self.status_bar.showMessage(f"Failed to change preview theme: {str(e)}", 3000)
+            self._status_ok(f"Preview theme changed to {_pretty_theme(theme_name)}")
+        except (KeyError, RuntimeError) as e:
+            # Unknown theme name or the web view has already been torn down
+            self._status_err("Failed to change preview theme", e)
     
     def change_editor_theme(self, theme_name: str):
         """Change the editor theme"""
@@ -749,55 +946,84 @@ Performance Features:
             self.editor.set_theme(theme_name)
             # Save editor theme preference
             self.settings_manager.set_editor_theme(theme_name)
-            self.status_bar.showMessage(f"Editor theme changed to {theme_name.replace('_', ' ').title()}", 2000)
-        except Exception as e:
-            self.status_bar.showMessage(f"Failed to change editor theme: {str(e)}", 3000)
+            self._status_ok(f"Editor theme changed to {_pretty_theme(theme_name)}")
+        except (KeyError, RuntimeError) as e:
+            # Unknown theme name or the editor has already been torn down
+            self._status_err("Failed to change editor theme", e)
     
     def print_preview(self):
         """Print the preview content"""
         try:
             self.preview.print_preview()
-        except Exception as e:
+        except RuntimeError as e:
+            # Raised by the bindings when the web page is no longer available
             QMessageBox.warning(self, "Print Error", f"Failed to print preview: {str(e)}")
     
     def navigate_to_heading(self, heading_text: str):
         """Navigate to a specific heading in both editor and preview"""
         try:
-            # Scroll editor to heading
-            self.editor.scroll_to_heading(heading_text)
-            
-            # Scroll preview to heading
-            self.preview.scroll_to_heading(heading_text)
-            
-            # Focus the editor
-            self.editor.focus()
+            # Suspend repaints so scroll + focus land in a single paint
+            self.editor.setUpdatesEnabled(False)
+            self.preview.setUpdatesEnabled(False)
+            try:
+                # Scroll editor to heading
+                self.editor.scroll_to_heading(heading_text)
+                
+                # Scroll preview to heading
+                self.preview.scroll_to_heading(heading_text)
+                
+                # Focus the editor
+                self.editor.focus()
+            finally:
+                self.editor.setUpdatesEnabled(True)
+                self.preview.setUpdatesEnabled(True)
             
-            self.status_bar.showMessage(f"Navigated to: {heading_text}", 2000)
+            message = self._nav_status_cache.get(heading_text)
+            if message is None:
+                message = self._nav_status_cache[heading_text] = f"Navigated to: {heading_text}"
+            self._status_ok(message)
         except Exception as e:
-            self.status_bar.showMessage(f"Navigation failed: {str(e)}", 2000)
+            self._status_err("Navigation failed", e)
     
-    def show_search_dialog(self):
-        """Show the global search dialog"""
+    def _prewarm_search_dialog(self):
+        """Create the global search dialog ahead of first use"""
         if not self.search_dialog:
             self.search_dialog = SearchDialog(self.document_manager, self)
             self.search_dialog.document_selected.connect(self.load_document)
-        
+    
+    def show_search_dialog(self):
+        """Show the global search dialog"""
+        self._prewarm_search_dialog()  # No-op once built; the dialog is reused
         self.search_dialog.show_and_focus()
     
     def show_hotkeys(self):
         """Show the keyboard shortcuts dialog"""
-        HotkeyDialog.show_hotkeys(self)
+        # Built once; later presses just bring the existing dialog back
+        if self.hotkey_dialog is None:
+            self.hotkey_dialog = HotkeyDialog(self)
+        self.hotkey_dialog.show()
+        self.hotkey_dialog.raise_()
+        self.hotkey_dialog.activateWindow()
     
     def closeEvent(self, event):
         """Handle application close"""
-        # Auto-save before closing
+        # Auto-save on the save worker while session state is saved here
+        self.auto_save_timer.stop()
         if self.current_document_id:
-            self.auto_save()
+            content = self.editor.get_content()
+            doc_id = self.current_document_id
+            self._save_pool.start(lambda: self._write_document_content(doc_id, content))
         
         # Save session state
         self.save_session_state()
+        self._settings_flush_timer.stop()
+        self.settings_manager.sync()
+        
+        # Let pending writes finish, but don't let a stuck disk hang shutdown
+        self._save_pool.waitForDone(3000)
+        self.document_manager.close()
         
-        # Clear caches to free memory
-        self.clear_caches()
+        event.accept()
         
-        event.accept()
\ No newline at end of file
+        # Skip cache teardown, the window is already closing
+        self.clear_caches(for_exit=True)
\ No newline at end of file
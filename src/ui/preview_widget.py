@@ -4,14 +4,75 @@ Preview Widget - HTML preview of markdown content
 
 import markdown
 import re
+import base64
 import hashlib
+import functools
+import json
+import logging
 import os
 import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from PySide6.QtWidgets import QWidget, QVBoxLayout
 from PySide6.QtWebEngineWidgets import QWebEngineView
 from PySide6.QtWebEngineCore import (QWebEngineUrlScheme, QWebEngineUrlSchemeHandler, 
-                                      QWebEngineProfile, QWebEngineUrlRequestJob)
-from PySide6.QtCore import QUrl, QBuffer, QIODevice, Signal, QByteArray
+                                      QWebEngineProfile, QWebEngineUrlRequestJob, QWebEnginePage)
+from PySide6.QtCore import QUrl, QBuffer, QIODevice, Signal, QByteArray, QThreadPool
+from core.markdown_cache import MarkdownCache
+from pygments import highlight
+from pygments.lexers import get_lexer_by_name, guess_lexer
+from pygments.formatters import HtmlFormatter
+from pygments.util import ClassNotFound
+
+try:
+    import mistune
+except ImportError:
+    mistune = None  # Faster parser is optional; python-markdown is the fallback
+
+logger = logging.getLogger(__name__)
+
+# Leading magic bytes -> MIME type, looked up by 4-, 3- and 6-byte prefixes
+_IMAGE_MAGIC = {
+    b'\x89PNG': "image/png",
+    b'\xff\xd8\xff': "image/jpeg",
+    b'GIF87a': "image/gif",
+    b'GIF89a': "image/gif",
+}
+
+# Embedded image references in markdown, e.g. ![alt](image://42)
+_IMAGE_URL_RE = re.compile(r'image://(\d+)')
+
+# Base URL for preview pages, allows external content
+_BASE_URL = QUrl("https://localhost/")
+
+# Minimum block count before cold renders are spread over worker threads
+_PARALLEL_MIN_BLOCKS = 4
+
+# One or more blank (or whitespace-only) lines separating markdown blocks
+_BLANK_LINES_RE = re.compile(r'\n(?:[ \t]*\n)+')
+
+# Comment node placed before each block of an incrementally rendered body, so
+# later edits can swap just the changed run of blocks in place
+_BLOCK_MARK = "<!--mdb-->"
+
+# Replace blocks [start, start + removed) with new HTML; returns false (and
+# touches nothing) if the page does not hold the expected number of blocks
+_PATCH_BLOCKS_JS = """(function(start, removed, total, html) {
+    var body = document.body, marks = [];
+    for (var n = body.firstChild; n; n = n.nextSibling) {
+        if (n.nodeType === Node.COMMENT_NODE && n.data === 'mdb') marks.push(n);
+    }
+    if (marks.length !== total) return false;
+    var range = document.createRange();
+    if (start < total) range.setStartBefore(marks[start]);
+    else range.setStart(body, body.childNodes.length);
+    if (start + removed < total) range.setEndBefore(marks[start + removed]);
+    else range.setEnd(body, body.childNodes.length);
+    range.deleteContents();
+    range.insertNode(range.createContextualFragment(html));
+    return true;
+})(%d, %d, %d, %s);"""
 
 # Add resources directory to path for theme imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'resources'))
@@ -32,90 +93,207 @@ def register_custom_schemes():
 register_custom_schemes()
 
 
+if mistune is not None:
+    class HighlightRenderer(mistune.HTMLRenderer):
+        """mistune renderer that highlights code blocks with Pygments like codehilite"""
+        
+        _formatter = HtmlFormatter(cssclass='highlight')
+        
+        def block_code(self, code, info=None):
+            """Render a fenced or indented code block with syntax highlighting"""
+            try:
+                if info and info.strip():
+                    lexer = get_lexer_by_name(info.split(None, 1)[0])
+                else:
+                    lexer = guess_lexer(code)
+            except ClassNotFound:
+                return super().block_code(code, info)
+            return highlight(code, lexer, self._formatter)
+
+
 class ImageSchemeHandler(QWebEngineUrlSchemeHandler):
     """Custom URL scheme handler for embedded images"""
     
     def __init__(self, image_handler):
         super().__init__()
         self.image_handler = image_handler
+        self._live_buffers = {}  # id(buffer) -> (buffer, bytes) for in-flight replies
     
     def requestStarted(self, request):
         """Handle image:// URL requests"""
         url = request.requestUrl()
-        print(f"ImageSchemeHandler: Handling URL: {url.toString()}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("ImageSchemeHandler: Handling URL: %s", url.toString())
         
         if url.scheme() == "image":
             try:
                 image_id = int(url.host())
-                print(f"ImageSchemeHandler: Looking for image ID: {image_id}")
+                logger.debug("ImageSchemeHandler: Looking for image ID: %d", image_id)
                 
                 result = self.image_handler.get_image_data(image_id)
                 
                 if result:
                     image_data = result
-                    print(f"ImageSchemeHandler: Found image data, size: {len(image_data)} bytes")
+                    logger.debug("ImageSchemeHandler: Found image data, size: %d bytes", len(image_data))
                     
                     # Detect image format from data
                     mime_type = self._detect_image_mime_type(image_data)
-                    print(f"ImageSchemeHandler: Detected MIME type: {mime_type}")
+                    logger.debug("ImageSchemeHandler: Detected MIME type: %s", mime_type)
                     
-                    buffer = QBuffer()
-                    buffer.setData(QByteArray(image_data))
+                    # Parent the buffer to the request so Qt frees it with the job, and
+                    # wrap the bytes without copying; keep them alive until then
+                    buffer = QBuffer(request)
+                    buffer.setData(QByteArray.fromRawData(image_data))
+                    key = id(buffer)
+                    self._live_buffers[key] = (buffer, image_data)
+                    buffer.destroyed.connect(lambda *args, key=key: self._live_buffers.pop(key, None))
                     buffer.open(QIODevice.ReadOnly)
                     request.reply(mime_type.encode(), buffer)
-                    print("ImageSchemeHandler: Successfully replied with image data")
+                    logger.debug("ImageSchemeHandler: Successfully replied with image data")
                 else:
-                    print(f"ImageSchemeHandler: Image ID {image_id} not found")
+                    logger.warning("ImageSchemeHandler: Image ID %d not found", image_id)
                     request.fail(QWebEngineUrlRequestJob.UrlNotFound)
             except (ValueError, TypeError) as e:
-                print(f"ImageSchemeHandler: Invalid URL format: {e}")
+                logger.warning("ImageSchemeHandler: Invalid URL format: %s", e)
                 request.fail(QWebEngineUrlRequestJob.UrlInvalid)
         else:
-            print(f"ImageSchemeHandler: Non-image scheme: {url.scheme()}")
+            logger.warning("ImageSchemeHandler: Non-image scheme: %s", url.scheme())
             request.fail(QWebEngineUrlRequestJob.UrlInvalid)
     
     def _detect_image_mime_type(self, image_data: bytes) -> str:
         """Detect MIME type from image data"""
-        if image_data.startswith(b'\x89PNG'):
-            return "image/png"
-        elif image_data.startswith(b'\xff\xd8\xff'):
-            return "image/jpeg"
-        elif image_data.startswith(b'GIF87a') or image_data.startswith(b'GIF89a'):
-            return "image/gif"
-        elif image_data.startswith(b'RIFF') and b'WEBP' in image_data[:12]:
+        mime_type = (_IMAGE_MAGIC.get(image_data[:4]) or _IMAGE_MAGIC.get(image_data[:3])
+                     or _IMAGE_MAGIC.get(image_data[:6]))
+        if mime_type:
+            return mime_type
+        if image_data[:4] == b'RIFF' and image_data[8:12] == b'WEBP':
             return "image/webp"
-        else:
-            return "image/png"  # Default fallback
+        return "image/png"  # Default fallback
+
+
+@functools.lru_cache(maxsize=8)
+def _document_head(theme_css: str) -> bytes:
+    """Build the static part of the preview document up to the body content, as UTF-8"""
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <meta http-equiv="Content-Security-Policy" content="default-src 'none'; img-src data: image: https: http:; style-src 'unsafe-inline'; script-src 'unsafe-inline';">
+    <title>Markdown Preview</title>
+    <script>
+        // Scroll is restored by the script at the end of the body
+        history.scrollRestoration = 'manual';
+    </script>
+    <style>
+        {theme_css}
+        
+        /* Performance optimizations */
+        * {{
+            box-sizing: border-box;
+        }}
+        
+        body {{
+            text-rendering: optimizeLegibility;
+            -webkit-font-smoothing: antialiased;
+            -moz-osx-font-smoothing: grayscale;
+            contain: layout style paint;
+        }}
+        
+        /* Optimized code block styling */
+        .codehilite {{
+            border-radius: 6px;
+            margin: 16px 0;
+            overflow-x: auto;
+            position: relative;
+            contain: layout style paint;
+        }}
+        
+        .codehilite pre {{
+            margin: 0;
+            border: none;
+            font-size: 0.9em;
+            line-height: 1.4;
+            will-change: scroll-position;
+        }}
+        
+        /* Optimized image handling */
+        img {{
+            max-width: 100%;
+            height: auto;
+            will-change: auto;
+            contain: layout style paint;
+        }}
+        
+        /* Optimized table styling */
+        table {{
+            border-radius: 6px;
+            overflow: hidden;
+            contain: layout style paint;
+        }}
+        
+        /* Performance improvements for large documents */
+        @media (min-height: 1000px) {{
+            body {{
+                contain: layout style paint size;
+            }}
+        }}
+    </style>
+</head>
+<body>
+    """.encode('utf-8')
+
+
+# End of the preview document. The page keeps its own scroll offset in
+# sessionStorage (which survives setContent reloads of the same view) and
+# restores it right after the content is parsed, before first paint, so
+# reloads need no save/restore round trips through runJavaScript
+_DOCUMENT_TAIL = b"""
+    <script>
+    (function() {
+        try {
+            var y = sessionStorage.getItem('previewScrollY');
+            if (y) window.scrollTo(0, +y);
+            window.addEventListener('scroll', function() {
+                sessionStorage.setItem('previewScrollY', window.pageYOffset);
+            }, {passive: true});
+        } catch (e) {}
+    })();
+    </script>
+</body>
+</html>"""
 
 
 class PreviewWidget(QWidget):
-    def __init__(self, image_handler=None):
+    render_complete = Signal()  # Emitted once new content has reached the page
+    _prerendered = Signal(int, str)  # Render sequence number, content parsed on the worker
+    
+    def __init__(self, image_handler=None, profile=None):
         super().__init__()
         self.image_handler = image_handler
+        self._profile = profile  # Shared QWebEngineProfile, or None for the default one
         self._updating_scroll = False  # Flag to prevent scroll loops
-        self._html_cache = {}  # Cache for rendered HTML content
         self._cache_max_size = 200  # Increased cache size for better performance
-        self._cache_hit_count = 0  # Track cache performance
-        self._cache_miss_count = 0
+        self._block_cache_max_size = 500
         self._last_content_hash = None  # Track last rendered content
         self._current_theme = 'dark'  # Default theme
-        self._cache_access_times = {}  # Track access times for LRU eviction
-        self._render_queue = []  # Queue for batched rendering
+        self._last_rendered_bytes = b""  # Backing store of the page being loaded
+        self._shell_loaded_theme = None  # Theme of the loaded page, once it can be patched
+        self._pending_shell_theme = None  # Theme of the page currently loading
+        self._render_queue = deque(maxlen=1)  # Latest pending content; older entries drop out
         self._render_timer = None  # Timer for debounced rendering
+        self._render_seq = 0  # Bumped per dispatched render; older worker results are dropped
         self._precompiled_css = {}  # Cache for precompiled CSS themes
+        self._shown_blocks = None  # Markdown blocks behind the page body, if it was built from blocks
         
         # Incremental parsing optimization
         self._last_markdown_content = ""  # Track last content for diffing
-        self._block_cache = {}  # Cache for individual markdown blocks
         self._block_separator = "\n\n"  # Markdown block separator
         self._incremental_threshold = 5000  # Use incremental parsing for docs > 5KB
         
-        # Scroll position preservation
-        self._saved_scroll_position = 0  # Store scroll position before update
-        self._restore_scroll_pending = False  # Flag to restore scroll after load
-        
         self.setup_ui()
         self.setup_markdown()
+        self.setup_render_caches()
         self.setup_render_timer()
     
     def setup_ui(self):
@@ -125,13 +303,16 @@ class PreviewWidget(QWidget):
         
         # Create web view
         self.web_view = QWebEngineView()
+        if self._profile is not None:
+            self.web_view.setPage(QWebEnginePage(self._profile, self.web_view))
         
         # Configure web engine profile to allow external content
         profile = self.web_view.page().profile()
         
-        # Set custom scheme handler for images
-        if self.image_handler:
+        # Set custom scheme handler for images (once per profile; pages share it)
+        if self.image_handler and profile.urlSchemeHandler(b"image") is None:
             handler = ImageSchemeHandler(self.image_handler)
+            handler.setParent(profile)  # Lives as long as the profile, not this widget
             profile.installUrlSchemeHandler(b"image", handler)
         
         # Enable loading of external images and resources
@@ -139,8 +320,6 @@ class PreviewWidget(QWidget):
         settings = self.web_view.settings()
         settings.setAttribute(QWebEngineSettings.WebAttribute.AutoLoadImages, True)
         settings.setAttribute(QWebEngineSettings.WebAttribute.AllowRunningInsecureContent, True)
-        settings.setAttribute(QWebEngineSettings.WebAttribute.LocalContentCanAccessRemoteUrls, True)
-        settings.setAttribute(QWebEngineSettings.WebAttribute.LocalContentCanAccessFileUrls, True)
         
         # Connect to load finished signal to restore scroll position
         self.web_view.loadFinished.connect(self._on_load_finished)
@@ -154,10 +333,34 @@ class PreviewWidget(QWidget):
         self._render_timer.setSingleShot(True)
         self._render_timer.timeout.connect(self._process_render_queue)
         self._render_timer.setInterval(100)  # 100ms debounce for better performance
+        
+        # Parsing runs on a single worker so typing never waits on the parser;
+        # the GUI thread then applies the result from the warm render caches
+        self._render_pool = QThreadPool(self)
+        self._render_pool.setMaxThreadCount(1)
+        self._prerendered.connect(self._on_prerendered)
     
     def setup_markdown(self):
         """Setup markdown processor with extensions"""
-        self.md = markdown.Markdown(
+        self._mistune, self.md = self._create_processors()
+        
+        # Parsers are stateful, so worker threads get their own instances
+        self._thread_processors = threading.local()
+        self._thread_processors.processors = (self._mistune, self.md)
+        self._block_executor = None  # Created on first parallel render
+    
+    def _create_processors(self):
+        """Create the (mistune, python-markdown) processor pair"""
+        # Prefer mistune when installed; it renders several times faster
+        mistune_md = None
+        if mistune is not None:
+            mistune_md = mistune.create_markdown(
+                renderer=HighlightRenderer(escape=False),
+                hard_wrap=True,  # Same line breaks as nl2br
+                plugins=['table', 'strikethrough']
+            )
+        
+        md = markdown.Markdown(
             extensions=[
                 'codehilite',
                 'fenced_code',
@@ -172,6 +375,33 @@ class PreviewWidget(QWidget):
                 }
             }
         )
+        return mistune_md, md
+    
+    def setup_render_caches(self):
+        """Setup LRU caches for rendered document bodies and individual blocks"""
+        # functools.lru_cache keeps recency in C, so hits and evictions are O(1)
+        self._render_html = functools.lru_cache(maxsize=self._cache_max_size)(self._render_html_uncached)
+        self._convert_block = functools.lru_cache(maxsize=self._block_cache_max_size)(self._convert_markdown)
+        # Stored images never change, so their data URLs can be reused across renders
+        self._image_data_url = functools.lru_cache(maxsize=64)(self._encode_image)
+        # Rendered bodies persisted across runs, keyed by content hash
+        self._disk_cache = MarkdownCache()
+        
+        # Trim the on-disk cache once the UI is up rather than during startup
+        from PySide6.QtCore import QTimer
+        QTimer.singleShot(2000, self._disk_cache.prune)
+    
+    def _convert_markdown(self, text: str) -> str:
+        """Convert markdown text to HTML with a freshly reset processor"""
+        processors = getattr(self._thread_processors, 'processors', None)
+        if processors is None:
+            processors = self._thread_processors.processors = self._create_processors()
+        mistune_md, md = processors
+        
+        if mistune_md is not None:
+            return mistune_md(text)
+        md.reset()
+        return md.convert(text)
     
     def update_content(self, markdown_content: str):
         """Update the preview with enhanced caching and batched rendering"""
@@ -183,17 +413,48 @@ class PreviewWidget(QWidget):
             self._render_timer.start()
     
     def _process_render_queue(self):
-        """Process the render queue with optimized batching and incremental parsing"""
+        """Parse the latest queued content on the render worker"""
         if not self._render_queue:
             return
         
         # Get the latest content from queue (discard intermediate updates)
-        markdown_content = self._render_queue[-1]
-        self._render_queue.clear()
+        markdown_content = self._render_queue.popleft()
+        if self._last_content_hash is not None and markdown_content == self._last_markdown_content:
+            return
         
-        # Generate cache key from content hash and theme
-        content_key = f"{markdown_content}_{self._current_theme}"
-        content_hash = hashlib.md5(content_key.encode('utf-8')).hexdigest()
+        self._render_seq += 1
+        seq = self._render_seq
+        self._render_pool.start(lambda: self._prerender(seq, markdown_content))
+    
+    def _prerender(self, seq: int, markdown_content: str):
+        """Fill the render caches for content (runs on the render worker)"""
+        try:
+            self._render_html(markdown_content)
+        except Exception as e:
+            logger.error("Background render failed: %s", e)
+        self._prerendered.emit(seq, markdown_content)
+    
+    def _on_prerendered(self, seq: int, markdown_content: str):
+        """Show content parsed on the worker unless a newer render superseded it"""
+        if seq == self._render_seq:
+            self._render_now(markdown_content)
+    
+    def _render_now(self, markdown_content: str):
+        """Render the given markdown synchronously, bypassing the debounce timer"""
+        # Cheap exit for a re-sent buffer (theme changes reset _last_content_hash)
+        if self._last_content_hash is not None and markdown_content == self._last_markdown_content:
+            return
+        
+        # Store for theme switching
+        self._last_markdown_content = markdown_content
+        
+        # Generate change-detection key from content hash and theme
+        # (not security sensitive, so a short BLAKE2b digest is enough);
+        # feed both parts separately to avoid building a concatenated copy
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(markdown_content.encode('utf-8'))
+        hasher.update(self._current_theme.encode('utf-8'))
+        content_hash = hasher.digest()
         
         # Skip update if content and theme haven't changed
         if content_hash == self._last_content_hash:
@@ -201,82 +462,117 @@ class PreviewWidget(QWidget):
         
         self._last_content_hash = content_hash
         
-        # Save current scroll position before updating
-        self._save_scroll_position()
-        
-        # Check cache first with LRU tracking
-        if content_hash in self._html_cache:
-            full_html = self._html_cache[content_hash]
-            self._cache_hit_count += 1
-            self._update_cache_access_time(content_hash)
-        else:
-            self._cache_miss_count += 1
-            
-            # Replace image:// URLs with data URLs before processing markdown
-            if self.image_handler:
-                processed_content = self._replace_image_urls(markdown_content)
-            else:
-                processed_content = markdown_content
-            
-            # Use incremental parsing for large documents
-            if len(processed_content) > self._incremental_threshold:
-                html_content = self._incremental_parse(processed_content)
+        # Once a page with the current theme is loaded, only the body needs
+        # replacing; styles and scripts stay parsed and the scroll offset is kept
+        if self._shell_loaded_theme == self._current_theme:
+            blocks = self._content_blocks(markdown_content)
+            if blocks is not None and self._shown_blocks is not None:
+                # Large document already on the page: re-send only the changed blocks
+                self._patch_blocks(self._shown_blocks, blocks)
             else:
-                # Reset markdown processor to clear any state
-                self.md.reset()
-                html_content = self.md.convert(processed_content)
-            
-            # Wrap in complete HTML document with optimized styling
-            full_html = self._create_html_document_optimized(html_content)
-            
-            # Cache the result with LRU management
-            self._cache_html_lru(content_hash, full_html)
+                self._replace_body(self._render_html(markdown_content))
+            self._shown_blocks = blocks
+            return
         
-        # Store for theme switching
-        self._last_markdown_content = markdown_content
+        # Render the body (or fetch it from the LRU cache)
+        body_html = self._render_html(markdown_content)
+        self._shown_blocks = self._content_blocks(markdown_content)
         
-        # Mark that we need to restore scroll position after load
-        self._restore_scroll_pending = True
+        # The page restores its own scroll offset (see _DOCUMENT_TAIL)
+        self._shell_loaded_theme = None
+        self._pending_shell_theme = self._current_theme
         
-        # Use setHtml with a base URL to allow external content
-        from PySide6.QtCore import QUrl
-        base_url = QUrl("https://localhost/")
-        self.web_view.setHtml(full_html, base_url)
+        # Hand WebEngine UTF-8 bytes directly (no QString round-trip) with a base
+        # URL to allow external content; keep the bytes alive while Qt reads them
+        self._last_rendered_bytes = self._create_html_document_optimized(body_html)
+        self.web_view.page().setContent(QByteArray.fromRawData(self._last_rendered_bytes),
+                                        "text/html;charset=UTF-8", _BASE_URL)
+    
+    def _content_blocks(self, markdown_content: str):
+        """Markdown blocks the body is rendered from, or None for documents rendered whole"""
+        if self.image_handler:
+            markdown_content = self._replace_image_urls(markdown_content)
+        if len(markdown_content) <= self._incremental_threshold:
+            return None
+        return self._split_into_blocks(markdown_content)
+    
+    def _patch_blocks(self, old_blocks: list, new_blocks: list):
+        """Replace only the blocks between the unchanged head and tail of the page"""
+        start = 0
+        limit = min(len(old_blocks), len(new_blocks))
+        while start < limit and old_blocks[start] == new_blocks[start]:
+            start += 1
+        old_end, new_end = len(old_blocks), len(new_blocks)
+        while old_end > start and new_end > start and old_blocks[old_end - 1] == new_blocks[new_end - 1]:
+            old_end -= 1
+            new_end -= 1
+        
+        if start == old_end and start == new_end:
+            return  # Only blank lines between blocks changed
+        
+        html = ''.join(_BLOCK_MARK + self._convert_block(block) + '\n'
+                       for block in new_blocks[start:new_end])
+        script = _PATCH_BLOCKS_JS % (start, old_end - start, len(old_blocks), json.dumps(html))
+        self.web_view.page().runJavaScript(script, self._on_blocks_patched)
+    
+    def _on_blocks_patched(self, ok):
+        """Fall back to a full body replace if the page did not hold the expected blocks"""
+        if ok is not True:
+            self._replace_body(self._render_html(self._last_markdown_content))
+            self._shown_blocks = self._content_blocks(self._last_markdown_content)
+        else:
+            self.render_complete.emit()
     
-    def _update_cache_access_time(self, cache_key: str):
-        """Update access time for LRU cache management"""
-        from datetime import datetime
-        self._cache_access_times[cache_key] = datetime.now()
+    def _replace_body(self, body_html: str):
+        """Swap the body of the loaded page, keeping styles, scripts and scroll offset"""
+        self.web_view.page().runJavaScript(f"document.body.innerHTML = {json.dumps(body_html)};",
+                                           lambda _result: self.render_complete.emit())
+    
+    def _render_html_uncached(self, markdown_content: str) -> str:
+        """Render markdown to the HTML that goes inside the document body"""
+        # Replace image:// URLs with data URLs before processing markdown. Such
+        # bodies carry base64 image data tied to this database, so they are
+        # rendered fresh rather than persisted to the disk cache
+        if self.image_handler and _IMAGE_URL_RE.search(markdown_content):
+            return self._convert_full(self._replace_image_urls(markdown_content))
+        
+        # Reuse HTML rendered in an earlier session when available. Include the
+        # parser, since mistune and python-markdown output differ; the "2" suffix
+        # retires entries cached before block markers existed
+        parser = "mistune2" if self._mistune is not None else "markdown2"
+        return self._disk_cache.render(markdown_content, parser, self._convert_full)
+    
+    def _convert_full(self, markdown_content: str) -> str:
+        """Convert a whole document, block by block when it is large"""
+        if len(markdown_content) > self._incremental_threshold:
+            return self._incremental_parse(markdown_content)
+        return self._convert_markdown(markdown_content)
     
     def _incremental_parse(self, markdown_content: str) -> str:
         """Parse markdown incrementally by caching individual blocks"""
         # Split content into blocks (paragraphs, code blocks, etc.)
         blocks = self._split_into_blocks(markdown_content)
         
-        html_parts = []
-        for block in blocks:
-            block_hash = hashlib.md5(block.encode('utf-8')).hexdigest()
-            
-            # Check block cache
-            if block_hash in self._block_cache:
-                html_parts.append(self._block_cache[block_hash])
-            else:
-                # Parse only this block
-                self.md.reset()
-                block_html = self.md.convert(block)
-                
-                # Cache the block
-                self._block_cache[block_hash] = block_html
-                html_parts.append(block_html)
-                
-                # Limit block cache size
-                if len(self._block_cache) > 500:
-                    self._evict_block_cache()
+        # Unchanged blocks come straight from the block cache. When most blocks
+        # are new (e.g. first open of a large document), convert them on a small
+        # thread pool; Pygments highlighting of big code blocks overlaps there
+        block_info = self._convert_block.cache_info()
+        if len(blocks) >= _PARALLEL_MIN_BLOCKS and block_info.currsize < len(blocks) // 2:
+            if self._block_executor is None:
+                self._block_executor = ThreadPoolExecutor(max_workers=4)
+            html_parts = list(self._block_executor.map(self._convert_block, blocks))
+        else:
+            html_parts = [self._convert_block(block) for block in blocks]
         
-        return '\n'.join(html_parts)
+        # Each block is preceded by a marker comment so edits can be patched per block
+        return ''.join(_BLOCK_MARK + part + '\n' for part in html_parts)
     
     def _split_into_blocks(self, content: str) -> list:
         """Split markdown content into cacheable blocks"""
+        # Without code fences, blocks are just the runs between blank lines
+        if '```' not in content:
+            return [block for block in _BLANK_LINES_RE.split(content.strip('\n')) if block]
+        
         blocks = []
         current_block = []
         in_code_block = False
@@ -310,16 +606,8 @@ class PreviewWidget(QWidget):
         
         return blocks
     
-    def _evict_block_cache(self):
-        """Evict oldest entries from block cache"""
-        # Remove oldest 25% of entries
-        entries_to_remove = len(self._block_cache) // 4
-        cache_keys = list(self._block_cache.keys())
-        for key in cache_keys[:entries_to_remove]:
-            del self._block_cache[key]
-    
-    def _create_html_document_optimized(self, content: str) -> str:
-        """Create HTML document with optimized CSS caching"""
+    def _create_html_document_optimized(self, content: str) -> bytes:
+        """Create the UTF-8 HTML document with optimized CSS caching"""
         # Check if CSS is already compiled for this theme
         if self._current_theme not in self._precompiled_css:
             theme_css = PreviewThemes.get_theme(self._current_theme)
@@ -329,116 +617,10 @@ class PreviewWidget(QWidget):
         
         return self._create_html_document_with_css(content, theme_css)
     
-    def _create_html_document_with_css(self, content: str, theme_css: str) -> str:
-        """Create HTML document with provided CSS (optimized version)"""
-        # Inject scroll restoration script to prevent visible jump
-        scroll_position = self._saved_scroll_position if self._restore_scroll_pending else 0
-        
-        return f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta http-equiv="Content-Security-Policy" content="default-src 'self' data: https: http:; img-src 'self' data: https: http:; style-src 'self' 'unsafe-inline'; script-src 'self' 'unsafe-inline';">
-    <title>Markdown Preview</title>
-    <style>
-        {theme_css}
-        
-        /* Performance optimizations */
-        * {{
-            box-sizing: border-box;
-        }}
-        
-        /* Prevent flash during scroll restoration */
-        html {{
-            {f'opacity: 0;' if scroll_position > 0 else ''}
-        }}
-        
-        html.scroll-restored {{
-            opacity: 1;
-            transition: opacity 0.05s ease-in;
-        }}
-        
-        body {{
-            text-rendering: optimizeLegibility;
-            -webkit-font-smoothing: antialiased;
-            -moz-osx-font-smoothing: grayscale;
-            contain: layout style paint;
-        }}
-        
-        /* Optimized code block styling */
-        .codehilite {{
-            border-radius: 6px;
-            margin: 16px 0;
-            overflow-x: auto;
-            position: relative;
-            contain: layout style paint;
-        }}
-        
-        .codehilite pre {{
-            margin: 0;
-            border: none;
-            font-size: 0.9em;
-            line-height: 1.4;
-            will-change: scroll-position;
-        }}
-        
-        /* Optimized image handling */
-        img {{
-            max-width: 100%;
-            height: auto;
-            will-change: auto;
-            contain: layout style paint;
-        }}
-        
-        /* Optimized table styling */
-        table {{
-            border-radius: 6px;
-            overflow: hidden;
-            contain: layout style paint;
-        }}
-        
-        /* Performance improvements for large documents */
-        @media (min-height: 1000px) {{
-            body {{
-                contain: layout style paint size;
-            }}
-        }}
-    </style>
-    <script>
-        // Restore scroll position immediately on load to prevent flash
-        (function() {{
-            var savedPosition = {scroll_position};
-            
-            function restoreScroll() {{
-                if (savedPosition > 0) {{
-                    window.scrollTo(0, savedPosition);
-                    // Show content after scroll is restored
-                    document.documentElement.classList.add('scroll-restored');
-                }} else {{
-                    // No scroll to restore, show immediately
-                    document.documentElement.classList.add('scroll-restored');
-                }}
-            }}
-            
-            // Restore as early as possible
-            if (document.readyState === 'loading') {{
-                document.addEventListener('DOMContentLoaded', restoreScroll);
-            }} else {{
-                restoreScroll();
-            }}
-            
-            // Fallback: ensure content is visible after short delay
-            setTimeout(function() {{
-                document.documentElement.classList.add('scroll-restored');
-            }}, 100);
-        }})();
-    </script>
-</head>
-<body>
-    {content}
-</body>
-</html>"""
+    def _create_html_document_with_css(self, content: str, theme_css: str) -> bytes:
+        """Create the UTF-8 HTML document with provided CSS (optimized version)"""
+        # Head and tail bytes are built once; only the body is encoded per render
+        return _document_head(theme_css) + content.encode('utf-8') + _DOCUMENT_TAIL
     
     def sync_scroll(self, scroll_percentage: float):
         """Synchronize scroll position with editor"""
@@ -459,67 +641,41 @@ class PreviewWidget(QWidget):
         
         self.web_view.page().runJavaScript(script, lambda result: setattr(self, '_updating_scroll', False))
     
-    def _save_scroll_position(self):
-        """Save current scroll position before content update"""
-        script = """
-        (function() {
-            return window.pageYOffset || document.documentElement.scrollTop;
-        })();
-        """
-        self.web_view.page().runJavaScript(script, self._on_scroll_position_saved)
-    
-    def _on_scroll_position_saved(self, position):
-        """Callback when scroll position is retrieved"""
-        if position is not None:
-            self._saved_scroll_position = position
-    
     def _on_load_finished(self, ok):
         """Handle load finished event"""
-        if ok and self._restore_scroll_pending:
-            self._restore_scroll_pending = False
-            # Scroll position is already restored via inline script in HTML
-            # This is just for cleanup and potential fallback
-            if self._saved_scroll_position > 0:
-                # Double-check scroll position as fallback
-                script = f"""
-                (function() {{
-                    var currentScroll = window.pageYOffset || document.documentElement.scrollTop;
-                    if (currentScroll === 0 && {self._saved_scroll_position} > 0) {{
-                        window.scrollTo(0, {self._saved_scroll_position});
-                    }}
-                }})();
-                """
-                self.web_view.page().runJavaScript(script)
+        if ok:
+            # The page shell can now take body-only updates
+            self._shell_loaded_theme = self._pending_shell_theme
+            self.render_complete.emit()
     
     def _replace_image_urls(self, markdown_content: str) -> str:
         """Replace image:// URLs with data URLs, leave online URLs unchanged"""
-        import re
-        import base64
-        
         def replace_local_image_url(match):
             try:
                 image_id = int(match.group(1))
-                print(f"PreviewWidget: Converting image://{image_id} to data URL")
+                logger.debug("PreviewWidget: Converting image://%d to data URL", image_id)
                 
-                result = self.image_handler.get_image_data(image_id)
-                if result:
-                    image_data = result
-                    # Convert to base64 data URL
-                    base64_data = base64.b64encode(image_data).decode('utf-8')
-                    data_url = f"data:image/png;base64,{base64_data}"
-                    print(f"PreviewWidget: Created data URL of length {len(data_url)}")
+                data_url = self._image_data_url(image_id)
+                if data_url:
+                    logger.debug("PreviewWidget: Created data URL of length %d", len(data_url))
                     return data_url
                 else:
-                    print(f"PreviewWidget: Image {image_id} not found")
+                    logger.warning("PreviewWidget: Image %d not found", image_id)
                     return match.group(0)  # Return original if not found
             except Exception as e:
-                print(f"PreviewWidget: Error converting image URL: {e}")
+                logger.warning("PreviewWidget: Error converting image URL: %s", e)
                 return match.group(0)  # Return original on error
         
         # Replace only image://ID with data URLs, leave http/https URLs unchanged
-        pattern = r'image://(\d+)'
-        result = re.sub(pattern, replace_local_image_url, markdown_content)
-        return result
+        return _IMAGE_URL_RE.sub(replace_local_image_url, markdown_content)
+    
+    def _encode_image(self, image_id: int):
+        """Build the base64 data URL for a stored image, or None if it is missing"""
+        image_data = self.image_handler.get_image_data(image_id)
+        if not image_data:
+            return None
+        base64_data = base64.b64encode(image_data).decode('utf-8')
+        return f"data:image/png;base64,{base64_data}"
   
     def _create_html_document(self, content: str) -> str:
         """Create a complete HTML document with enhanced styling and theming"""
@@ -655,70 +811,39 @@ class PreviewWidget(QWidget):
         </html>
         """
     
-    def _cache_html_lru(self, content_hash: str, html: str):
-        """Cache HTML content with LRU management"""
-        # If cache is full, remove LRU entries
-        if len(self._html_cache) >= self._cache_max_size:
-            self._evict_lru_html()
-        
-        self._html_cache[content_hash] = html
-        self._update_cache_access_time(content_hash)
-    
-    def _evict_lru_html(self):
-        """Evict least recently used HTML cache entries"""
-        if not self._cache_access_times:
-            # Fallback to removing oldest entries
-            entries_to_remove = max(1, self._cache_max_size // 4)
-            cache_keys = list(self._html_cache.keys())
-            for key in cache_keys[:entries_to_remove]:
-                del self._html_cache[key]
-            return
-        
-        # Sort by access time and remove oldest 25%
-        sorted_keys = sorted(self._cache_access_times.items(), key=lambda x: x[1])
-        entries_to_remove = max(1, len(sorted_keys) // 4)
-        
-        for key, _ in sorted_keys[:entries_to_remove]:
-            if key in self._html_cache:
-                del self._html_cache[key]
-            if key in self._cache_access_times:
-                del self._cache_access_times[key]
-    
     def get_cache_stats(self) -> dict:
         """Get cache performance statistics"""
-        total_requests = self._cache_hit_count + self._cache_miss_count
-        hit_rate = (self._cache_hit_count / total_requests * 100) if total_requests > 0 else 0
+        html_info = self._render_html.cache_info()
+        block_info = self._convert_block.cache_info()
+        total_requests = html_info.hits + html_info.misses
+        hit_rate = (html_info.hits / total_requests * 100) if total_requests > 0 else 0
         
         return {
-            "cache_size": len(self._html_cache),
+            "cache_size": html_info.currsize,
             "cache_max_size": self._cache_max_size,
-            "cache_hits": self._cache_hit_count,
-            "cache_misses": self._cache_miss_count,
+            "cache_hits": html_info.hits,
+            "cache_misses": html_info.misses,
             "hit_rate_percent": round(hit_rate, 2),
-            "block_cache_size": len(self._block_cache),
+            "block_cache_size": block_info.currsize,
+            "block_cache_max_size": self._block_cache_max_size,
+            "block_cache_hits": block_info.hits,
+            "block_cache_misses": block_info.misses,
+            **self._disk_cache.get_stats(),
             "incremental_threshold": self._incremental_threshold
         }
     
     def optimize_cache(self):
-        """Optimize cache using LRU eviction"""
-        if len(self._html_cache) > self._cache_max_size * 0.8:
-            self._evict_lru_html()
-        
-        # Clean up orphaned access times
-        valid_keys = set(self._html_cache.keys())
-        orphaned_keys = set(self._cache_access_times.keys()) - valid_keys
-        for key in orphaned_keys:
-            del self._cache_access_times[key]
+        """Optimize cache (the LRU caches are size-bounded, so nothing to evict)"""
+        pass
     
     def clear_cache(self):
         """Clear HTML cache and reset statistics"""
-        self._html_cache.clear()
-        self._cache_access_times.clear()
+        self._render_html.cache_clear()
+        self._convert_block.cache_clear()
+        self._image_data_url.cache_clear()
+        self._disk_cache.prune()
         self._precompiled_css.clear()
         self._render_queue.clear()
-        self._block_cache.clear()
-        self._cache_hit_count = 0
-        self._cache_miss_count = 0
         self._last_content_hash = None
         self._last_markdown_content = ""
     
@@ -729,15 +854,19 @@ class PreviewWidget(QWidget):
             # Precompile CSS for new theme
             if theme_name not in self._precompiled_css:
                 self._precompiled_css[theme_name] = PreviewThemes.get_theme(theme_name)
+            _document_head(self._precompiled_css[theme_name])  # Prebuild the document head
             
-            # Clear HTML cache but keep CSS cache
-            self._html_cache.clear()
-            self._cache_access_times.clear()
+            # Rendered bodies are theme-independent; the theme change reloads the page shell
             self._last_content_hash = None
             
-            # Trigger content refresh if we have content
-            if hasattr(self, '_last_markdown_content'):
-                self.update_content(self._last_markdown_content)
+            # Refresh right away; a still-pending edit is newer than the last render
+            if self._render_timer:
+                self._render_timer.stop()
+            if self._render_queue:
+                self._render_seq += 1  # Anything still on the worker is older than this
+                self._render_now(self._render_queue.popleft())
+            elif hasattr(self, '_last_markdown_content'):
+                self._render_now(self._last_markdown_content)
     
     def get_current_theme(self) -> str:
         """Get the current theme name"""
@@ -3,13 +3,50 @@ JavaScript-based Preview Widget - HTML preview using JavaScript markdown parser
 """
 
 import os
-import sys
-import base64
+import functools
 from PySide6.QtWidgets import QWidget, QVBoxLayout
 from PySide6.QtWebEngineWidgets import QWebEngineView
-from PySide6.QtWebEngineCore import (QWebEngineUrlScheme, QWebEngineUrlSchemeHandler,
+from PySide6.QtWebEngineCore import (QWebEngineUrlSchemeHandler, QWebEnginePage,
                                       QWebEngineProfile, QWebEngineUrlRequestJob, QWebEngineSettings)
-from PySide6.QtCore import QUrl, QBuffer, QIODevice, QByteArray, QTimer
+from PySide6.QtCore import QCoreApplication, QUrl, QBuffer, QIODevice, QByteArray, QTimer, QObject, Signal, Slot
+from PySide6.QtWebChannel import QWebChannel
+
+# MIME type by leading magic bytes; other JPEG variants fall back on a 3-byte check
+_MIME_BY_MAGIC = {
+    b'\x89PNG': 'image/png',
+    b'\xff\xd8\xff\xe0': 'image/jpeg',
+    b'\xff\xd8\xff\xe1': 'image/jpeg',
+    b'\xff\xd8\xff\xdb': 'image/jpeg',
+    b'GIF8': 'image/gif',
+}
+
+# The renderer is inlined into the template so the page needs one less local:// fetch
+_RESOURCES_DIR = os.path.join(os.path.dirname(__file__), '..', 'resources')
+_RENDERER_SCRIPT_TAG = '<script src="local:///preview_renderer.js"></script>'
+
+
+@functools.lru_cache(maxsize=1)
+def _combined_template() -> bytes:
+    """Read the preview template once, with the renderer script inlined, as UTF-8"""
+    with open(os.path.join(_RESOURCES_DIR, 'preview_template.html'), 'r', encoding='utf-8') as f:
+        template = f.read()
+    with open(os.path.join(_RESOURCES_DIR, 'preview_renderer.js'), 'r', encoding='utf-8') as f:
+        renderer = f.read()
+    return template.replace(_RENDERER_SCRIPT_TAG, f'<script>\n{renderer}\n</script>').encode('utf-8')
+
+
+_WEB_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "markdown-editor", "webcache")
+
+
+@functools.lru_cache(maxsize=1)
+def _preview_profile() -> QWebEngineProfile:
+    """Profile shared by all preview pages, with a persistent disk HTTP cache"""
+    # Owned by the application so it outlives every page that uses it
+    profile = QWebEngineProfile("preview", QCoreApplication.instance())
+    profile.setCachePath(_WEB_CACHE_DIR)
+    profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+    return profile
+
 
 class ResourceSchemeHandler(QWebEngineUrlSchemeHandler):
     """Custom URL scheme handler for local resources (local://)"""
@@ -79,6 +116,51 @@ class ResourceSchemeHandler(QWebEngineUrlSchemeHandler):
         return mime_types.get(ext, 'application/octet-stream')
 
 
+class ImageSchemeHandler(QWebEngineUrlSchemeHandler):
+    """Custom URL scheme handler for stored images (image://<id>)"""
+
+    def __init__(self, image_handler, parent=None):
+        super().__init__(parent)
+        self.image_handler = image_handler
+
+    def requestStarted(self, request: QWebEngineUrlRequestJob):
+        """Reply with the raw image bytes, so no base64 data URL is needed"""
+        try:
+            image_id = int(request.requestUrl().host())
+        except ValueError:
+            request.fail(QWebEngineUrlRequestJob.Error.UrlInvalid)
+            return
+
+        image_data = self.image_handler.get_image_data(image_id)
+        if not image_data:
+            request.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+
+        # Detect image format
+        header = bytes(image_data[:4])
+        mime_type = _MIME_BY_MAGIC.get(header)
+        if mime_type is None:
+            mime_type = 'image/jpeg' if header[:3] == b'\xff\xd8\xff' else 'image/png'
+
+        # Parent the buffer to the request so Qt frees it with the job
+        buffer = QBuffer(request)
+        buffer.setData(QByteArray(image_data))
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        request.reply(mime_type.encode(), buffer)
+
+
+class PreviewBridge(QObject):
+    """QWebChannel object shared with the page as ``py_bridge``"""
+
+    contentChanged = Signal(str)
+    pageReady = Signal()
+
+    @Slot()
+    def ready(self):
+        """Called by the page once its channel connection is set up"""
+        self.pageReady.emit()
+
+
 class PreviewWidgetJS(QWidget):
     """JavaScript-based preview widget"""
 
@@ -88,11 +170,12 @@ class PreviewWidgetJS(QWidget):
         self._current_theme = 'dark'
         self._last_markdown_content = ""
         self._page_loaded = False
-        self._pending_updates = []
+        self._bridge_ready = False
+        self._pending_markdown = None  # Latest unsent content; older edits are dropped
         self._update_timer = QTimer()
         self._update_timer.setSingleShot(True)
         self._update_timer.timeout.connect(self._process_pending_updates)
-        self._update_timer.setInterval(100)  # 100ms debounce
+        self._update_timer.setInterval(100)  # 100ms debounce, scaled up for large documents
         
         # Setup resource scheme handler
         self._setup_resource_handler()
@@ -101,12 +184,16 @@ class PreviewWidgetJS(QWidget):
     
     def _setup_resource_handler(self):
         """Setup custom URL scheme handler for local resources"""
-        # Get the default profile
-        profile = QWebEngineProfile.defaultProfile()
+        # Handlers live on the shared profile, so install them only once
+        profile = _preview_profile()
         
         # Create and install resource handler
-        self.resource_handler = ResourceSchemeHandler(self)
-        profile.installUrlSchemeHandler(b"local", self.resource_handler)
+        if profile.urlSchemeHandler(b"local") is None:
+            profile.installUrlSchemeHandler(b"local", ResourceSchemeHandler(profile))
+
+        # Serve stored images over image:// (the scheme is registered in main)
+        if self.image_handler and profile.urlSchemeHandler(b"image") is None:
+            profile.installUrlSchemeHandler(b"image", ImageSchemeHandler(self.image_handler, profile))
 
     def setup_ui(self):
         """Setup the preview UI"""
@@ -115,6 +202,7 @@ class PreviewWidgetJS(QWidget):
 
         # Create web view
         self.web_view = QWebEngineView()
+        self.web_view.setPage(QWebEnginePage(_preview_profile(), self.web_view))
 
         # Enable necessary settings
         settings = self.web_view.settings()
@@ -127,6 +215,14 @@ class PreviewWidgetJS(QWidget):
         # Connect to load finished signal
         self.web_view.loadFinished.connect(self._on_load_finished)
 
+        # Content goes to the page over QWebChannel as a plain string, so no
+        # per-update script has to be escaped, assembled and re-parsed
+        self._bridge = PreviewBridge(self)
+        self._bridge.pageReady.connect(self._on_bridge_ready)
+        self._channel = QWebChannel(self)
+        self._channel.registerObject("py_bridge", self._bridge)
+        self.web_view.page().setWebChannel(self._channel)
+
         layout.addWidget(self.web_view)
 
         # Load the HTML template
@@ -134,16 +230,11 @@ class PreviewWidgetJS(QWidget):
 
     def _load_template(self):
         """Load the HTML template with local resources"""
-        template_path = os.path.join(os.path.dirname(__file__), '..', 'resources', 'preview_template.html')
-
         try:
-            # Read template
-            with open(template_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-
-            # Load HTML with local:// base URL for local resources
+            # Hand WebEngine the pre-encoded bytes (no QString round-trip per
+            # view) with a local:// base URL for local resources
             base_url = QUrl("local:///")
-            self.web_view.setHtml(html_content, base_url)
+            self.web_view.setContent(QByteArray(_combined_template()), "text/html;charset=UTF-8", base_url)
         except Exception as e:
             print(f"✗ Error loading template: {e}")
             import traceback
@@ -158,130 +249,52 @@ class PreviewWidgetJS(QWidget):
 
             # Set initial theme
             self._apply_theme(self._current_theme)
-
-            # Process any pending updates
-            if self._pending_updates:
-                self._process_pending_updates()
         else:
             print("Preview page failed to load")
 
+    def _on_bridge_ready(self):
+        """Handle the page connecting to the web channel"""
+        self._bridge_ready = True
+
+        # Process any pending updates
+        if self._pending_markdown is not None:
+            self._process_pending_updates()
+
     def update_content(self, markdown_content: str):
         """Update the preview with new markdown content"""
+        # Nothing to do if this is what was last requested (== short-circuits
+        # on length, and the queued update, if any, already carries it)
+        if markdown_content == self._last_markdown_content:
+            return
         self._last_markdown_content = markdown_content
 
-        # Add to pending updates queue
-        self._pending_updates.append(markdown_content)
+        # Replace any pending update; only the latest content is ever sent
+        self._pending_markdown = markdown_content
 
-        # Start/restart the update timer for debouncing
+        # Start/restart the update timer for debouncing; large documents wait
+        # longer (1 ms per 10k chars, capped at 500 ms) so fast typing sends less
+        self._update_timer.setInterval(min(500, 100 + len(markdown_content) // 10000))
         self._update_timer.start()
 
     def _process_pending_updates(self):
         """Process pending content updates"""
-        if not self._pending_updates:
+        if self._pending_markdown is None or not self._bridge_ready:
+            # Nothing to send, or page (or its channel) not ready yet; keep it pending
             return
 
-        # Get the latest content (discard intermediate updates)
-        markdown_content = self._pending_updates[-1]
-        self._pending_updates.clear()
-
-        if not self._page_loaded:
-            # Page not loaded yet, keep in queue
-            self._pending_updates.append(markdown_content)
-            return
-
-        # Process image URLs to data URLs
-        if self.image_handler:
-            processed_content = self._replace_image_urls(markdown_content)
-        else:
-            processed_content = markdown_content
-
-        # Escape content for JavaScript (handle special characters)
-        escaped_content = (processed_content
-                          .replace('\\', '\\\\')
-                          .replace('`', '\\`')
-                          .replace('$', '\\$')
-                          .replace('\r\n', '\\n')
-                          .replace('\n', '\\n')
-                          .replace('\r', '\\n'))
+        markdown_content = self._pending_markdown
+        self._pending_markdown = None
 
-        # Send update to JavaScript with fallback rendering
-        script = f"""
-        (function() {{
-            if (typeof marked === 'undefined') {{
-                document.getElementById('preview-content').innerHTML = '<p style="color: #ff6b6b;">⚠️ marked.js library not loaded. Check internet connection.</p>';
-                return;
-            }}
-            
-            if (window.markdownRenderer) {{
-                window.markdownRenderer.updateContent(`{escaped_content}`);
-            }} else {{
-                // Fallback: render directly if renderer not initialized
-                try {{
-                    var html = marked.parse(`{escaped_content}`);
-                    document.getElementById('preview-content').innerHTML = html;
-                    
-                    // Apply syntax highlighting
-                    if (typeof hljs !== 'undefined') {{
-                        document.querySelectorAll('pre code').forEach((block) => {{
-                            hljs.highlightElement(block);
-                        }});
-                    }}
-                }} catch (e) {{
-                    console.error('Rendering error:', e);
-                    document.getElementById('preview-content').innerHTML = '<p style="color: #ff6b6b;">Error rendering markdown: ' + e.message + '</p>';
-                }}
-            }}
-        }})();
-        """
-
-        self.web_view.page().runJavaScript(script)
-
-    def _replace_image_urls(self, markdown_content: str) -> str:
-        """Replace image:// URLs with data URLs"""
-        import re
-
-        def replace_local_image_url(match):
-            try:
-                image_id = int(match.group(1))
-                result = self.image_handler.get_image_data(image_id)
-
-                if result:
-                    image_data = result
-                    # Convert to base64 data URL
-                    base64_data = base64.b64encode(image_data).decode('utf-8')
-
-                    # Detect image format
-                    if image_data.startswith(b'\x89PNG'):
-                        mime_type = 'image/png'
-                    elif image_data.startswith(b'\xff\xd8\xff'):
-                        mime_type = 'image/jpeg'
-                    elif image_data.startswith(b'GIF'):
-                        mime_type = 'image/gif'
-                    else:
-                        mime_type = 'image/png'
-
-                    data_url = f"data:{mime_type};base64,{base64_data}"
-                    return data_url
-                else:
-                    return match.group(0)
-            except Exception as e:
-                print(f"Error converting image URL: {e}")
-                return match.group(0)
-
-        # Replace only image://ID with data URLs
-        pattern = r'image://(\d+)'
-        result = re.sub(pattern, replace_local_image_url, markdown_content)
-        return result
+        # Send update to JavaScript (Qt marshals the string over the channel)
+        self._bridge.contentChanged.emit(markdown_content)
 
     def set_theme(self, theme_name: str):
         """Set the preview theme"""
         self._current_theme = theme_name
+        # Only the stylesheets change; the rendered HTML is theme-independent,
+        # so there is no need to re-parse and re-highlight the document
         self._apply_theme(theme_name)
 
-        # Trigger content refresh
-        if self._last_markdown_content:
-            self.update_content(self._last_markdown_content)
-
     def _apply_theme(self, theme_name: str):
         """Apply theme via JavaScript"""
         if not self._page_loaded:
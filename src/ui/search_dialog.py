@@ -16,6 +16,7 @@ class SearchDialog(QDialog):
         super().__init__(parent)
         self.document_manager = document_manager
         self.search_results = []
+        self._item_to_doc_id = {}  # Result item -> document ID
         self.setup_ui()
     
     def setup_ui(self):
@@ -89,6 +90,7 @@ class SearchDialog(QDialog):
         # Clear previous results
         self.results_tree.clear()
         self.search_results = []
+        self._item_to_doc_id = {}
         
         # Perform search
         case_sensitive = self.case_sensitive_checkbox.isChecked()
@@ -103,40 +105,51 @@ class SearchDialog(QDialog):
         self.search_results = results
         self.result_label.setText(f"Found {len(results)} document(s)")
         
-        for result in results:
-            # Create parent item for document
-            doc_item = QTreeWidgetItem([
-                result['title'],
-                f"{result['match_count']} match(es)"
-            ])
-            doc_item.setData(0, Qt.UserRole, result['id'])
-            
-            # Make document title bold
-            font = doc_item.font(0)
-            font.setBold(True)
-            doc_item.setFont(0, font)
-            
-            self.results_tree.addTopLevelItem(doc_item)
-            
-            # Add title matches
-            if result['title_matches']:
-                title_match_item = QTreeWidgetItem(["Title match", ""])
-                title_match_item.setForeground(0, Qt.gray)
-                doc_item.addChild(title_match_item)
-            
-            # Add content matches with context
-            for i, context in enumerate(result['content_matches'], 1):
-                match_item = QTreeWidgetItem([context, ""])
-                match_item.setData(0, Qt.UserRole, result['id'])
+        # One bold font shared by every document row
+        bold_font = QFont(self.results_tree.font())
+        bold_font.setBold(True)
+        
+        # Fill the tree with repaints and signals held, so it updates once
+        tree = self.results_tree
+        tree.setUpdatesEnabled(False)
+        tree.blockSignals(True)
+        try:
+            for result in results:
+                # Create parent item for document
+                doc_item = QTreeWidgetItem([
+                    result.title,
+                    f"{result.match_count} match(es)"
+                ])
+                self._item_to_doc_id[doc_item] = result.id
                 
-                # Highlight the query in the context
-                match_item.setToolTip(0, context)
+                # Make document title bold
+                doc_item.setFont(0, bold_font)
                 
-                doc_item.addChild(match_item)
-            
-            # Expand the first few results
-            if len(self.search_results) <= 3:
-                doc_item.setExpanded(True)
+                self.results_tree.addTopLevelItem(doc_item)
+                
+                # Add title matches
+                if result.title_matches:
+                    title_match_item = QTreeWidgetItem(["Title match", ""])
+                    title_match_item.setForeground(0, Qt.gray)
+                    self._item_to_doc_id[title_match_item] = result.id
+                    doc_item.addChild(title_match_item)
+                
+                # Add content matches with context
+                for i, context in enumerate(result.content_matches, 1):
+                    match_item = QTreeWidgetItem([context, ""])
+                    self._item_to_doc_id[match_item] = result.id
+                
+                    # Highlight the query in the context
+                    match_item.setToolTip(0, context)
+                
+                    doc_item.addChild(match_item)
+                
+                # Expand the first few results
+                if len(self.search_results) <= 3:
+                    doc_item.setExpanded(True)
+        finally:
+            tree.blockSignals(False)
+            tree.setUpdatesEnabled(True)
         
         # Select first result
         if self.results_tree.topLevelItemCount() > 0:
@@ -157,12 +170,8 @@ class SearchDialog(QDialog):
         if not selected_items:
             return
         
-        item = selected_items[0]
-        
-        # Get document ID from item or its parent
-        doc_id = item.data(0, Qt.UserRole)
-        if doc_id is None and item.parent():
-            doc_id = item.parent().data(0, Qt.UserRole)
+        # Every result row, document or match, maps to its document
+        doc_id = self._item_to_doc_id.get(selected_items[0])
         
         if doc_id:
             self.document_selected.emit(doc_id)
@@ -6,12 +6,94 @@ import re
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTreeWidget, 
                                QTreeWidgetItem, QPushButton, QListWidget, 
                                QListWidgetItem, QTabWidget, QInputDialog, 
-                               QMessageBox, QMenu, QLabel, QTableWidget,
-                               QTableWidgetItem, QHeaderView, QAbstractItemView)
-from PySide6.QtCore import Signal, Qt
+                               QMessageBox, QMenu, QLabel, QTableView,
+                               QHeaderView, QAbstractItemView)
+from PySide6.QtCore import Signal, Qt, QTimer, QAbstractTableModel, QModelIndex
 from PySide6.QtGui import QAction
 from core.document_manager import Document
 
+# Fence lines (no group 1) and ATX headings: group 1 is the hashes, group 2 the raw title
+_OUTLINE_RE = re.compile(r'^(?:```|~~~|(#{1,6})[ \t]+(.*))', re.MULTILINE)
+
+# Outline indentation by heading level (1-6)
+_INDENTS = ("", "  ", "    ", "      ", "        ", "          ")
+
+
+class DocumentTableModel(QAbstractTableModel):
+    """Two-column (#, title) model over the document list; the view pulls only visible rows"""
+    
+    _HEADERS = ("#", "Document")
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.documents = []
+        self._id_to_row = None  # Document ID -> row, rebuilt lazily after rows move
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.documents)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            # The index column is derived from the row, so inserts and removals never rewrite it
+            return str(row + 1) if index.column() == 0 else self.documents[row].title
+        if role == Qt.UserRole:
+            return self.documents[row].id
+        if role == Qt.TextAlignmentRole and index.column() == 0:
+            return Qt.AlignCenter
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._HEADERS[section]
+        return None
+    
+    def set_documents(self, documents: list[Document]):
+        """Replace all rows with a single model reset"""
+        self.beginResetModel()
+        self.documents = list(documents)
+        self._id_to_row = None
+        self.endResetModel()
+    
+    def insert_document(self, row: int, doc: Document):
+        """Insert one document row"""
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.documents.insert(row, doc)
+        self._id_to_row = None
+        self.endInsertRows()
+        self._renumbered(row + 1)
+    
+    def remove_row(self, row: int):
+        """Remove one document row"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.documents[row]
+        self._id_to_row = None
+        self.endRemoveRows()
+        self._renumbered(row)
+    
+    def document_at(self, row: int):
+        """Document shown in the given row, or None"""
+        if 0 <= row < len(self.documents):
+            return self.documents[row]
+        return None
+    
+    def row_of(self, doc_id: int) -> int:
+        """Row showing the given document ID, or -1"""
+        if self._id_to_row is None:
+            self._id_to_row = {doc.id: row for row, doc in enumerate(self.documents)}
+        return self._id_to_row.get(doc_id, -1)
+    
+    def _renumbered(self, start: int):
+        """Tell views the index column changed from the given row down"""
+        if start < len(self.documents):
+            self.dataChanged.emit(self.index(start, 0), self.index(len(self.documents) - 1, 0),
+                                  [Qt.DisplayRole])
+
 
 class SidebarWidget(QWidget):
     document_selected = Signal(int)  # Emits document ID
@@ -22,8 +104,20 @@ class SidebarWidget(QWidget):
     
     def __init__(self):
         super().__init__()
-        self.documents = []
+        self._doc_model = DocumentTableModel(self)
+        self._unlisted_count = 0  # Documents beyond the loaded page, still shown in the count
         self.heading_data = []  # Store heading info for navigation
+        self._pending_markdown = None  # Content the outline has not been built from yet
+        self._outline_dirty = False
+        self._last_headings = None  # (level, title) list the outline was last built from
+        self._last_outline_content = None  # Content those headings were extracted from
+        
+        # Coalesce bursts of edits into one outline scan
+        self._outline_timer = QTimer(self)
+        self._outline_timer.setSingleShot(True)
+        self._outline_timer.setInterval(200)
+        self._outline_timer.timeout.connect(self._do_update_outline)
+        
         self.setup_ui()
     
     def setup_ui(self):
@@ -41,6 +135,8 @@ class SidebarWidget(QWidget):
         self.outline_widget = self._create_outline_tab()
         self.tab_widget.addTab(self.outline_widget, "Outline")
         
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
+        
         layout.addWidget(self.tab_widget)
     
     def _create_documents_tab(self) -> QWidget:
@@ -68,9 +164,8 @@ class SidebarWidget(QWidget):
         button_layout.addWidget(self.doc_count_label)
         
         # Document table
-        self.document_table = QTableWidget()
-        self.document_table.setColumnCount(2)
-        self.document_table.setHorizontalHeaderLabels(["#", "Document"])
+        self.document_table = QTableView()
+        self.document_table.setModel(self._doc_model)
         
         # Configure table appearance
         self.document_table.setSelectionBehavior(QAbstractItemView.SelectRows)
@@ -78,6 +173,7 @@ class SidebarWidget(QWidget):
         self.document_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.document_table.setAlternatingRowColors(True)
         self.document_table.verticalHeader().setVisible(False)
+        self.document_table.setWordWrap(False)
         
         # Set column widths
         header = self.document_table.horizontalHeader()
@@ -85,8 +181,8 @@ class SidebarWidget(QWidget):
         header.setSectionResizeMode(1, QHeaderView.Stretch)  # Title column
         
         # Connect signals
-        self.document_table.cellClicked.connect(self._on_document_cell_clicked)
-        self.document_table.cellDoubleClicked.connect(self._on_document_cell_double_clicked)
+        self.document_table.clicked.connect(self._on_document_clicked)
+        self.document_table.doubleClicked.connect(self._on_document_double_clicked)
         self.document_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.document_table.customContextMenuRequested.connect(self._show_context_menu)
         
@@ -127,12 +223,12 @@ class SidebarWidget(QWidget):
     
     def _delete_document(self):
         """Handle document deletion"""
-        current_row = self.document_table.currentRow()
+        current_row = self.document_table.currentIndex().row()
         if current_row >= 0:
-            title_item = self.document_table.item(current_row, 1)
-            if title_item:
-                doc_id = title_item.data(Qt.UserRole)
-                title = title_item.text()
+            doc = self._doc_model.document_at(current_row)
+            if doc:
+                doc_id = doc.id
+                title = doc.title
                 
                 reply = QMessageBox.question(
                     self, "Delete Document", 
@@ -143,18 +239,16 @@ class SidebarWidget(QWidget):
                 if reply == QMessageBox.Yes:
                     self.document_deleted.emit(doc_id)
     
-    def _on_document_cell_clicked(self, row: int, column: int):
+    def _on_document_clicked(self, index: QModelIndex):
         """Handle document cell click"""
-        title_item = self.document_table.item(row, 1)
-        if title_item:
-            doc_id = title_item.data(Qt.UserRole)
-            if doc_id:
-                self.document_selected.emit(doc_id)
-                self.delete_button.setEnabled(True)
-    
-    def _on_document_cell_double_clicked(self, row: int, column: int):
+        doc = self._doc_model.document_at(index.row())
+        if doc and doc.id:
+            self.document_selected.emit(doc.id)
+            self.delete_button.setEnabled(True)
+    
+    def _on_document_double_clicked(self, index: QModelIndex):
         """Handle document cell double-click for renaming"""
-        self._rename_document(row)
+        self._rename_document(index.row())
     
     def _show_context_menu(self, position):
         """Show context menu for document table"""
@@ -177,12 +271,12 @@ class SidebarWidget(QWidget):
         if row < 0:
             return
             
-        title_item = self.document_table.item(row, 1)
-        if not title_item:
+        doc = self._doc_model.document_at(row)
+        if not doc:
             return
             
-        doc_id = title_item.data(Qt.UserRole)
-        current_title = title_item.text()
+        doc_id = doc.id
+        current_title = doc.title
         
         new_title, ok = QInputDialog.getText(
             self, "Rename Document", 
@@ -198,12 +292,12 @@ class SidebarWidget(QWidget):
         if row < 0:
             return
             
-        title_item = self.document_table.item(row, 1)
-        if not title_item:
+        doc = self._doc_model.document_at(row)
+        if not doc:
             return
             
-        doc_id = title_item.data(Qt.UserRole)
-        title = title_item.text()
+        doc_id = doc.id
+        title = doc.title
         
         reply = QMessageBox.question(
             self, "Delete Document", 
@@ -214,31 +308,17 @@ class SidebarWidget(QWidget):
         if reply == QMessageBox.Yes:
             self.document_deleted.emit(doc_id)
     
-    def update_documents(self, documents: list[Document]):
-        """Update the document table with numbered indices"""
-        self.documents = documents
-        self.document_table.setRowCount(0)
-        
-        for index, doc in enumerate(documents, start=1):
-            row_position = self.document_table.rowCount()
-            self.document_table.insertRow(row_position)
-            
-            # Index column
-            index_item = QTableWidgetItem(str(index))
-            index_item.setTextAlignment(Qt.AlignCenter)
-            self.document_table.setItem(row_position, 0, index_item)
-            
-            # Title column
-            title_item = QTableWidgetItem(doc.title)
-            title_item.setData(Qt.UserRole, doc.id)
-            self.document_table.setItem(row_position, 1, title_item)
-        
-        # Update document count label
-        count = len(documents)
-        if count == 1:
-            self.doc_count_label.setText("1 document")
-        else:
-            self.doc_count_label.setText(f"{count} documents")
+    @property
+    def documents(self) -> list[Document]:
+        """Documents in table order"""
+        return self._doc_model.documents
+    
+    def update_documents(self, documents: list[Document], total: int = None):
+        """Update the document table with numbered indices (total counts documents not passed in)"""
+        # One model reset; the view then asks only for the rows it paints
+        self._doc_model.set_documents(documents)
+        self._unlisted_count = max(0, total - len(documents)) if total is not None else 0
+        self._update_document_count()
         
         # Select first document if available
         if documents:
@@ -247,43 +327,121 @@ class SidebarWidget(QWidget):
         else:
             self.delete_button.setEnabled(False)
     
+    def add_document(self, doc: Document):
+        """Insert a single new document at the top of the table without a full reload"""
+        self._doc_model.insert_document(0, doc)
+        self._update_document_count()
+        self.document_table.selectRow(0)
+        self.delete_button.setEnabled(True)
+    
+    def remove_document(self, doc_id: int):
+        """Remove a single document row by ID without a full reload"""
+        row = self._doc_model.row_of(doc_id)
+        if row < 0:
+            return
+        
+        self._doc_model.remove_row(row)
+        self._update_document_count()
+        self.delete_button.setEnabled(self._doc_model.rowCount() > 0)
+    
+    def _update_document_count(self):
+        """Update the document count label"""
+        count = self._doc_model.rowCount() + self._unlisted_count
+        if count == 1:
+            self.doc_count_label.setText("1 document")
+        else:
+            self.doc_count_label.setText(f"{count} documents")
+    
     def update_outline(self, markdown_content: str):
-        """Update the outline from markdown content"""
-        self.outline_list.clear()
-        self.heading_data = []
+        """Update the outline from markdown content (debounced, and deferred while the tab is hidden)"""
+        self._pending_markdown = markdown_content
+        self._outline_dirty = True
+        self._outline_timer.start()
+    
+    def _do_update_outline(self):
+        """Rebuild the outline once edits settle, if its tab is showing"""
+        if self._outline_dirty and self.tab_widget.currentWidget() is self.outline_widget:
+            self._rebuild_outline()
+    
+    def _on_tab_changed(self, index: int):
+        """Build the outline on switching to its tab if content changed meanwhile"""
+        if self._outline_dirty and self.tab_widget.widget(index) is self.outline_widget:
+            self._outline_timer.stop()
+            self._rebuild_outline()
+    
+    def _rebuild_outline(self):
+        """Rebuild the outline from the pending content"""
+        markdown_content = self._pending_markdown
+        self._pending_markdown = None
+        self._outline_dirty = False
+        self._fill_outline(markdown_content)
+    
+    def _fill_outline(self, markdown_content: str):
+        """Rebuild the outline list and heading data if the headings changed"""
+        # Same buffer as last time (reload, re-sent content): skip the scan entirely
+        if markdown_content == self._last_outline_content:
+            return
+        self._last_outline_content = markdown_content
         
-        # Extract headers from markdown
-        headers = re.findall(r'^(#{1,6})\s+(.+)$', markdown_content, re.MULTILINE)
+        headings = self._extract_headings(markdown_content)
         
-        for level_str, title in headers:
-            level = len(level_str)
-            indent = "  " * (level - 1)
-            item_text = f"{indent}{title}"
-            
-            item = QListWidgetItem(item_text)
-            # Store the original heading text for navigation
-            item.setData(Qt.UserRole, title.strip())
-            self.outline_list.addItem(item)
+        # Most edits touch paragraph text only; leave the widgets alone then
+        if headings == self._last_headings:
+            return
+        self._last_headings = headings
+        
+        # Rebuild with repaints and signals suspended so the list redraws once
+        self.outline_list.setUpdatesEnabled(False)
+        self.outline_list.blockSignals(True)
+        try:
+            self.outline_list.clear()
+            self.heading_data = []
             
-            # Store heading data for reference
-            self.heading_data.append({
-                'level': level,
-                'text': title.strip(),
-                'display': item_text
-            })
+            for level, title in headings:
+                item_text = _INDENTS[level - 1] + title
+                
+                item = QListWidgetItem(item_text)
+                # Store the original heading text for navigation
+                item.setData(Qt.UserRole, title)
+                self.outline_list.addItem(item)
+                
+                # Store heading data for reference
+                self.heading_data.append({
+                    'level': level,
+                    'text': title,
+                    'display': item_text
+                })
+        finally:
+            self.outline_list.blockSignals(False)
+            self.outline_list.setUpdatesEnabled(True)
         
         # Update heading count label
-        count = len(headers)
+        count = len(self.heading_data)
         if count == 1:
             self.heading_count_label.setText("1 heading")
         else:
             self.heading_count_label.setText(f"{count} headings")
     
+    def _extract_headings(self, markdown_content: str) -> list:
+        """Return (level, title) for each ATX heading outside fenced code"""
+        headings = []
+        
+        # One C-level scan finds fence and heading lines; Python only runs per match
+        in_fence = False
+        for match in _OUTLINE_RE.finditer(markdown_content):
+            hashes = match.group(1)
+            if hashes is None:
+                in_fence = not in_fence
+            elif not in_fence:
+                title = match.group(2).strip()
+                if title:
+                    headings.append((len(hashes), title))
+        
+        return headings
+    
     def select_document(self, doc_id: int):
         """Programmatically select a document"""
-        for i in range(self.document_list.topLevelItemCount()):
-            item = self.document_list.topLevelItem(i)
-            if item.data(0, Qt.UserRole) == doc_id:
-                self.document_list.setCurrentItem(item)
-                self.delete_button.setEnabled(True)
-                break
\ No newline at end of file
+        row = self._doc_model.row_of(doc_id)
+        if row >= 0:
+            self.document_table.setCurrentIndex(self._doc_model.index(row, 1))
+            self.delete_button.setEnabled(True)
@@ -4,19 +4,73 @@ Markdown Syntax Highlighter - Custom syntax highlighting for markdown text
 
 import re
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QColor, QTextCharFormat, QFont, QSyntaxHighlighter, QTextDocument
+from PySide6.QtGui import (QColor, QTextCharFormat, QFont, QSyntaxHighlighter, QTextDocument,
+                           QTextBlockUserData)
+
+# Patterns are static; only the formats depend on the theme
+_HEADER_RE = re.compile(r'^#{1,6}\s.*$', re.MULTILINE)
+_BOLD_STAR_RE = re.compile(r'\*\*([^*]+)\*\*')
+_BOLD_UNDERSCORE_RE = re.compile(r'__([^_]+)__')
+_ITALIC_STAR_RE = re.compile(r'\*([^*]+)\*')
+_ITALIC_UNDERSCORE_RE = re.compile(r'_([^_]+)_')
+_CODE_BLOCK_RE = re.compile(r'```.*?```')  # Single-line fences; multi-line ones use block state
+_INLINE_CODE_RE = re.compile(r'`([^`]+)`')
+_LINK_RE = re.compile(r'\[([^\]]+)\]\([^)]+\)')
+_IMAGE_RE = re.compile(r'!\[([^\]]*)\]\([^)]+\)')
+_LIST_RE = re.compile(r'^[\s]*[-*+]\s', re.MULTILINE)
+_NUMBERED_LIST_RE = re.compile(r'^[\s]*\d+\.\s', re.MULTILINE)
+_BLOCKQUOTE_RE = re.compile(r'^>.*$', re.MULTILINE)
+
+# Block states for multi-line fenced code
+_STATE_NORMAL = 0
+_STATE_IN_CODE = 1
+
+# Line-level rules can only start at the beginning of a block, so one anchored
+# match decides which (if any) applies
+_LINE_RULES = (
+    ('header', _HEADER_RE),
+    ('list', _LIST_RE),
+    ('numbered_list', _NUMBERED_LIST_RE),
+    ('blockquote', _BLOCKQUOTE_RE),
+)
+_LINE_RE = re.compile('|'.join(f'(?P<{name}>{rx.pattern})' for name, rx in _LINE_RULES))
+
+# Inline rules as one alternation so each block is scanned once. At any position
+# the first alternative wins, so code spans come before the emphasis rules they
+# would otherwise contain
+_INLINE_RULES = (
+    ('code_block', _CODE_BLOCK_RE),
+    ('inline_code', _INLINE_CODE_RE),
+    ('image', _IMAGE_RE),
+    ('link', _LINK_RE),
+    ('bold_star', _BOLD_STAR_RE),
+    ('bold_underscore', _BOLD_UNDERSCORE_RE),
+    ('italic_star', _ITALIC_STAR_RE),
+    ('italic_underscore', _ITALIC_UNDERSCORE_RE),
+)
+_INLINE_RE = re.compile('|'.join(f'(?P<{name}>{rx.pattern})' for name, rx in _INLINE_RULES))
+
+
+class _BlockSpans(QTextBlockUserData):
+    """Rule spans last computed for a block, replayed on theme changes"""
+
+    def __init__(self, spans, state):
+        super().__init__()
+        self.spans = spans  # (start, length, rule group name)
+        self.state = state
 
 
 class MarkdownHighlighter(QSyntaxHighlighter):
     def __init__(self, parent: QTextDocument = None, theme_manager=None):
         super().__init__(parent)
         self.theme_manager = theme_manager
-        self.highlighting_rules = []
+        self._formats = {}  # Rule group name -> QTextCharFormat for the current theme
+        self._restyling = False  # True while reapplying cached spans with new formats
         self._setup_highlighting_rules()
     
     def _setup_highlighting_rules(self):
         """Setup syntax highlighting rules for markdown"""
-        self.highlighting_rules.clear()
+        self._formats = {}
         
         # Get colors from theme manager or use defaults
         def get_color(element, default):
@@ -28,107 +82,108 @@ class MarkdownHighlighter(QSyntaxHighlighter):
         header_format = QTextCharFormat()
         header_format.setForeground(get_color('header', "#569cd6"))
         header_format.setFontWeight(QFont.Bold)
-        self.highlighting_rules.append((
-            re.compile(r'^#{1,6}\s.*$', re.MULTILINE),
-            header_format
-        ))
+        self._formats['header'] = header_format
         
         # Bold text (**text** or __text__)
         bold_format = QTextCharFormat()
         bold_format.setFontWeight(QFont.Bold)
         bold_format.setForeground(get_color('bold', "#dcdcaa"))
-        self.highlighting_rules.append((
-            re.compile(r'\*\*([^*]+)\*\*'),
-            bold_format
-        ))
-        self.highlighting_rules.append((
-            re.compile(r'__([^_]+)__'),
-            bold_format
-        ))
+        self._formats['bold_star'] = bold_format
+        self._formats['bold_underscore'] = bold_format
         
         # Italic text (*text* or _text_)
         italic_format = QTextCharFormat()
         italic_format.setFontItalic(True)
         italic_format.setForeground(get_color('italic', "#ce9178"))
-        self.highlighting_rules.append((
-            re.compile(r'\*([^*]+)\*'),
-            italic_format
-        ))
-        self.highlighting_rules.append((
-            re.compile(r'_([^_]+)_'),
-            italic_format
-        ))
+        self._formats['italic_star'] = italic_format
+        self._formats['italic_underscore'] = italic_format
         
         # Code blocks (```code```)
         code_block_format = QTextCharFormat()
         code_block_format.setForeground(get_color('code', "#ce9178"))
         code_block_format.setFontFamily("Consolas")
-        self.highlighting_rules.append((
-            re.compile(r'```.*?```', re.DOTALL),
-            code_block_format
-        ))
+        self._formats['code_block'] = code_block_format
         
         # Inline code (`code`)
         inline_code_format = QTextCharFormat()
         inline_code_format.setForeground(get_color('code', "#ce9178"))
         inline_code_format.setFontFamily("Consolas")
-        self.highlighting_rules.append((
-            re.compile(r'`([^`]+)`'),
-            inline_code_format
-        ))
+        self._formats['inline_code'] = inline_code_format
         
         # Links [text](url)
         link_format = QTextCharFormat()
         link_format.setForeground(get_color('link', "#4ec9b0"))
         link_format.setUnderlineStyle(QTextCharFormat.SingleUnderline)
-        self.highlighting_rules.append((
-            re.compile(r'\[([^\]]+)\]\([^)]+\)'),
-            link_format
-        ))
+        self._formats['link'] = link_format
         
         # Images ![alt](url)
         image_format = QTextCharFormat()
         image_format.setForeground(get_color('link', "#4ec9b0"))
-        self.highlighting_rules.append((
-            re.compile(r'!\[([^\]]*)\]\([^)]+\)'),
-            image_format
-        ))
+        self._formats['image'] = image_format
         
         # Lists (- or * or +)
         list_format = QTextCharFormat()
         list_format.setForeground(get_color('list', "#c586c0"))
-        self.highlighting_rules.append((
-            re.compile(r'^[\s]*[-*+]\s', re.MULTILINE),
-            list_format
-        ))
+        self._formats['list'] = list_format
         
         # Numbered lists (1. 2. etc.)
         numbered_list_format = QTextCharFormat()
         numbered_list_format.setForeground(get_color('list', "#c586c0"))
-        self.highlighting_rules.append((
-            re.compile(r'^[\s]*\d+\.\s', re.MULTILINE),
-            numbered_list_format
-        ))
+        self._formats['numbered_list'] = numbered_list_format
         
         # Blockquotes (>)
         blockquote_format = QTextCharFormat()
         blockquote_format.setForeground(get_color('quote', "#6a9955"))
         blockquote_format.setFontItalic(True)
-        self.highlighting_rules.append((
-            re.compile(r'^>.*$', re.MULTILINE),
-            blockquote_format
-        ))
+        self._formats['blockquote'] = blockquote_format
     
     def update_theme(self, theme_manager):
         """Update theme and refresh highlighting rules"""
         self.theme_manager = theme_manager
         self._setup_highlighting_rules()
-        self.rehighlight()
+        
+        # Formats are stored by value in each block, so every block must be
+        # visited again, but the spans are replayed without any pattern matching
+        self._restyling = True
+        try:
+            self.rehighlight()
+        finally:
+            self._restyling = False
     
     def highlightBlock(self, text: str):
         """Apply syntax highlighting to a block of text"""
-        for pattern, format in self.highlighting_rules:
-            for match in pattern.finditer(text):
-                start = match.start()
-                length = match.end() - start
-                self.setFormat(start, length, format)
\ No newline at end of file
+        formats = self._formats
+        set_format = self.setFormat
+        
+        if self._restyling:
+            data = self.currentBlockUserData()
+            if data is not None:
+                for start, length, group in data.spans:
+                    set_format(start, length, formats[group])
+                self.setCurrentBlockState(data.state)
+                return
+        
+        # Fenced code spans blocks: format whole lines by state, no regex needed
+        is_fence = text.lstrip().startswith('```')
+        if self.previousBlockState() == _STATE_IN_CODE:
+            spans = [(0, len(text), 'code_block')]
+            state = _STATE_NORMAL if is_fence else _STATE_IN_CODE
+        elif is_fence and text.count('```') == 1:
+            spans = [(0, len(text), 'code_block')]
+            state = _STATE_IN_CODE
+        else:
+            spans = []
+            state = _STATE_NORMAL
+            # Line-level format first, then inline spans layered on top of it
+            # (e.g. bold or links inside headings and blockquotes)
+            match = _LINE_RE.match(text)
+            if match:
+                spans.append((0, match.end(), match.lastgroup))
+            for match in _INLINE_RE.finditer(text):
+                start, end = match.span()
+                spans.append((start, end - start, match.lastgroup))
+        
+        for start, length, group in spans:
+            set_format(start, length, formats[group])
+        self.setCurrentBlockState(state)
+        self.setCurrentBlockUserData(_BlockSpans(spans, state))
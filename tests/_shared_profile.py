@@ -0,0 +1,19 @@
+"""
+Shared QWebEngineProfile for the manual paste/preview test scripts
+"""
+
+from PySide6.QtCore import QCoreApplication
+from PySide6.QtWebEngineCore import QWebEngineProfile
+
+_profile = None
+
+
+def get_profile() -> QWebEngineProfile:
+    """Return the process-wide preview profile, creating it on first use"""
+    global _profile
+    if _profile is None:
+        # Owned by the application so it outlives every page that uses it
+        _profile = QWebEngineProfile("MarkdownEditor", QCoreApplication.instance())
+        _profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.MemoryHttpCache)
+        _profile.setPersistentCookiesPolicy(QWebEngineProfile.PersistentCookiesPolicy.NoPersistentCookies)
+    return _profile
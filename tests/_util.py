@@ -0,0 +1,33 @@
+"""
+Small helpers shared by the manual test scripts
+"""
+
+import os
+from functools import lru_cache
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+DOC_DIR = "tests/doc"  # Scratch databases, relative to the repository root
+
+
+@lru_cache(maxsize=None)
+def ensure_doc_dir(path: str = DOC_DIR) -> str:
+    """Create the scratch directory once per process and return it"""
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class PasteSignals(QObject):
+    finished = Signal(bool)  # True if an image was stored and inserted
+
+
+class PasteWorker(QRunnable):
+    """Encode and store a grabbed clipboard image off the GUI thread"""
+    
+    def __init__(self, image_handler, image, signals):
+        super().__init__()
+        self.image_handler = image_handler
+        self.image = image
+        self.signals = signals
+    
+    def run(self):
+        self.signals.finished.emit(self.image_handler.insert_image(self.image))
@@ -0,0 +1,27 @@
+"""
+Shared pytest fixtures: one QApplication per session and a fresh in-memory DocumentManager per test
+"""
+
+import os
+import sys
+
+import pytest
+
+# Make the application packages (ui, core) importable without PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """The single QApplication shared by every test in the session"""
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def doc_manager():
+    """A DocumentManager backed by a private in-memory database"""
+    from core.document_manager import DocumentManager
+    manager = DocumentManager(":memory:")
+    yield manager
+    manager.close()
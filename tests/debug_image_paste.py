@@ -5,25 +5,21 @@ Debug script to test image paste functionality step by step
 
 import sys
 from PySide6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget, QPushButton, QLabel, QTextEdit
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap, QClipboard
-from PySide6.QtWebEngineCore import QWebEngineUrlScheme
+from PySide6.QtCore import Qt, QThreadPool
+from PySide6.QtGui import QImage, QClipboard
 from ui.preview_widget import PreviewWidget
 from core.document_manager import DocumentManager
 from core.image_handler import ImageHandler
+from _shared_profile import get_profile
+from _util import PasteSignals, PasteWorker, ensure_doc_dir
 
 
 def main():
-    # Register custom URL scheme BEFORE creating QApplication
-    scheme = QWebEngineUrlScheme(b"image")
-    scheme.setFlags(QWebEngineUrlScheme.SecureScheme | QWebEngineUrlScheme.LocalScheme)
-    QWebEngineUrlScheme.registerScheme(scheme)
-    
+    # The image:// scheme is registered once when ui.preview_widget is imported
     app = QApplication(sys.argv)
     
     # Create test components
-    import os
-    os.makedirs("tests/doc", exist_ok=True)
+    ensure_doc_dir()
     doc_manager = DocumentManager("tests/doc/debug_image_paste.db")
     image_handler = ImageHandler(doc_manager)
     
@@ -47,7 +43,7 @@ def main():
     layout.addWidget(text_edit)
     
     # Add preview widget
-    preview = PreviewWidget(image_handler)
+    preview = PreviewWidget(image_handler, profile=get_profile())
     layout.addWidget(preview)
     
     # Add test buttons
@@ -67,13 +63,13 @@ def main():
     def create_test_image():
         """Create a simple test image and put it in clipboard"""
         try:
-            # Create a simple colored pixmap
-            pixmap = QPixmap(200, 100)
-            pixmap.fill(Qt.blue)
+            # Create a simple colored image (CPU-side, what the clipboard serializes anyway)
+            image = QImage(200, 100, QImage.Format_ARGB32_Premultiplied)
+            image.fill(Qt.blue)
             
             # Put it in clipboard
             clipboard = QApplication.clipboard()
-            clipboard.setPixmap(pixmap)
+            clipboard.setImage(image)
             
             status_label.setText("Test image created and copied to clipboard")
             print("Created test image in clipboard")
@@ -81,24 +77,36 @@ def main():
             status_label.setText(f"Error creating test image: {e}")
             print(f"Error creating test image: {e}")
     
+    paste_signals = PasteSignals()
+    
     def test_paste():
         """Test the paste functionality"""
         try:
             print("=== Starting paste test ===")
-            if image_handler.handle_paste():
-                status_label.setText("Image pasted successfully!")
-                # Update preview with current document content
-                current_doc = doc_manager.get_document(doc_id)
-                if current_doc:
-                    text_edit.setPlainText(current_doc.content)
-                    preview.update_content(current_doc.content)
-                    print("Updated preview with new content")
-            else:
+            # Clipboard access must stay on the GUI thread; encoding and storage run in the pool
+            image = image_handler.grab_clipboard_image()
+            if image.isNull():
                 status_label.setText("No image in clipboard or paste failed")
+                return
+            status_label.setText("Pasting image...")
+            QThreadPool.globalInstance().start(PasteWorker(image_handler, image, paste_signals))
         except Exception as e:
             status_label.setText(f"Error: {str(e)}")
             print(f"Error in test_paste: {e}")
     
+    def on_paste_finished(success):
+        """Refresh the UI once the worker has stored the image"""
+        if success:
+            status_label.setText("Image pasted successfully!")
+            # Update preview with current document content
+            current_doc = doc_manager.get_document(doc_id)
+            if current_doc:
+                text_edit.setPlainText(current_doc.content)
+                preview.update_content(current_doc.content)
+                print("Updated preview with new content")
+        else:
+            status_label.setText("No image in clipboard or paste failed")
+    
     def on_image_pasted(markdown_syntax):
         """Handle image pasted signal"""
         print(f"=== Image pasted signal received: {markdown_syntax} ===")
@@ -121,7 +129,8 @@ def main():
     # Connect signals
     test_button.clicked.connect(test_paste)
     create_test_image_button.clicked.connect(create_test_image)
-    image_handler.image_pasted.connect(on_image_pasted)
+    paste_signals.finished.connect(on_paste_finished, Qt.QueuedConnection)
+    image_handler.image_pasted.connect(on_image_pasted, Qt.QueuedConnection)
     
     # Set initial preview content
     preview.update_content("# Test Document\n\nThis is a test.\n\n")
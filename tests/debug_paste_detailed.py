@@ -5,26 +5,22 @@ Detailed debug script to trace image paste functionality
 
 import sys
 from PySide6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget, QPushButton, QLabel
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap
-from PySide6.QtWebEngineCore import QWebEngineUrlScheme
+from PySide6.QtCore import Qt, QThreadPool, QTimer
+from PySide6.QtGui import QImage
 from ui.editor_widget import EditorWidget
 from ui.preview_widget import PreviewWidget
 from core.document_manager import DocumentManager
 from core.image_handler import ImageHandler
+from _shared_profile import get_profile
+from _util import PasteSignals, PasteWorker, ensure_doc_dir
 
 
 def main():
-    # Register custom URL scheme BEFORE creating QApplication
-    scheme = QWebEngineUrlScheme(b"image")
-    scheme.setFlags(QWebEngineUrlScheme.SecureScheme | QWebEngineUrlScheme.LocalScheme)
-    QWebEngineUrlScheme.registerScheme(scheme)
-    
+    # The image:// scheme is registered once when ui.preview_widget is imported
     app = QApplication(sys.argv)
     
     # Create test components
-    import os
-    os.makedirs("tests/doc", exist_ok=True)
+    ensure_doc_dir()
     doc_manager = DocumentManager("tests/doc/debug_paste_detailed.db")
     image_handler = ImageHandler(doc_manager)
     
@@ -47,7 +43,7 @@ def main():
     layout.addWidget(editor)
     
     # Add preview widget
-    preview = PreviewWidget(image_handler)
+    preview = PreviewWidget(image_handler, profile=get_profile())
     layout.addWidget(preview)
     
     # Add test buttons
@@ -70,11 +66,11 @@ def main():
     def create_test_image():
         """Create test image in clipboard"""
         try:
-            pixmap = QPixmap(300, 200)
-            pixmap.fill(Qt.green)
+            image = QImage(300, 200, QImage.Format_ARGB32_Premultiplied)
+            image.fill(Qt.green)
             
             clipboard = QApplication.clipboard()
-            clipboard.setPixmap(pixmap)
+            clipboard.setImage(image)
             
             status_label.setText("✅ Test image created in clipboard - now try Ctrl+V in editor")
             print("=== Created test image in clipboard ===")
@@ -96,10 +92,10 @@ def main():
             print(f"Formats: {mime_data.formats()}")
             
             if mime_data.hasImage():
-                pixmap = clipboard.pixmap()
-                print(f"Pixmap size: {pixmap.width()}x{pixmap.height()}")
-                print(f"Pixmap is null: {pixmap.isNull()}")
-                status_label.setText(f"✅ Clipboard has image: {pixmap.width()}x{pixmap.height()}")
+                image = clipboard.image()
+                print(f"Image size: {image.width()}x{image.height()}")
+                print(f"Image is null: {image.isNull()}")
+                status_label.setText(f"✅ Clipboard has image: {image.width()}x{image.height()}")
             else:
                 status_label.setText("❌ No image in clipboard")
                 
@@ -107,27 +103,55 @@ def main():
             status_label.setText(f"❌ Error checking clipboard: {e}")
             print(f"Error checking clipboard: {e}")
     
+    paste_signals = PasteSignals()
+    
     def manual_paste_test():
         """Manually trigger paste test"""
         try:
             print("=== Manual Paste Test ===")
-            if image_handler.handle_paste():
-                status_label.setText("✅ Manual paste successful!")
-                # Update editor and preview
-                current_doc = doc_manager.get_document(doc_id)
-                if current_doc:
-                    editor.set_content(current_doc.content)
-                    preview.update_content(current_doc.content)
-            else:
+            # Clipboard access must stay on the GUI thread; encoding and storage run in the pool
+            image = image_handler.grab_clipboard_image()
+            if image.isNull():
                 status_label.setText("❌ Manual paste failed - no image found")
+                return
+            status_label.setText("⏳ Pasting image...")
+            QThreadPool.globalInstance().start(PasteWorker(image_handler, image, paste_signals))
         except Exception as e:
             status_label.setText(f"❌ Manual paste error: {e}")
             print(f"Manual paste error: {e}")
     
+    def on_manual_paste_finished(success):
+        """Refresh editor and preview once the worker has stored the image"""
+        if success:
+            status_label.setText("✅ Manual paste successful!")
+            # Update editor and preview
+            current_doc = doc_manager.get_document(doc_id)
+            if current_doc:
+                editor.set_content(current_doc.content)
+                preview.update_content(current_doc.content)
+        else:
+            status_label.setText("❌ Manual paste failed - could not store image")
+    
+    # Coalesce keystroke bursts into a single UPDATE
+    save_timer = QTimer()
+    save_timer.setSingleShot(True)
+    save_timer.setInterval(300)
+    pending_content = None
+    
+    def flush_pending_save():
+        """Write the latest editor content to the database"""
+        nonlocal pending_content
+        if pending_content is not None:
+            content, pending_content = pending_content, None
+            doc_manager.update_document(doc_id, content=content)
+    
     def on_editor_text_changed(content):
         """Update preview when editor content changes"""
+        nonlocal pending_content
         preview.update_content(content)
-        doc_manager.update_document(doc_id, content=content)
+        # Update document once typing pauses
+        pending_content = content
+        save_timer.start()
     
     def on_paste_requested():
         """Handle paste request from editor"""
@@ -150,9 +174,12 @@ def main():
     create_image_button.clicked.connect(create_test_image)
     check_clipboard_button.clicked.connect(check_clipboard)
     manual_paste_button.clicked.connect(manual_paste_test)
+    save_timer.timeout.connect(flush_pending_save)
+    app.aboutToQuit.connect(flush_pending_save)
     editor.text_changed.connect(on_editor_text_changed)
     editor.paste_requested.connect(on_paste_requested)
-    image_handler.image_pasted.connect(on_image_pasted)
+    paste_signals.finished.connect(on_manual_paste_finished, Qt.QueuedConnection)
+    image_handler.image_pasted.connect(on_image_pasted, Qt.QueuedConnection)
     
     # Set initial preview content
     preview.update_content("# Debug Test\n\nTesting image paste:\n\n")
@@ -16,7 +16,8 @@ try:
     
     # Test database initialization
     from core.document_manager import DocumentManager
-    os.makedirs("tests/doc", exist_ok=True)
+    from _util import ensure_doc_dir
+    ensure_doc_dir()
     dm = DocumentManager("tests/doc/test.db")  # Use file database for testing
     print("✓ Database initialization successful")
     
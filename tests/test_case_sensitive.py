@@ -85,20 +85,14 @@ JavaScript, javascript, and JAVASCRIPT are all different when case-sensitive.
     
     def create_test_documents(self):
         """Create test documents with various cases"""
-        self.doc_manager.create_document(
-            "Test Document 1",
-            "This is a TEST document with test and Test words."
-        )
-        
-        self.doc_manager.create_document(
-            "Python Guide",
-            "Python programming. python is great. PYTHON rocks!"
-        )
-        
-        self.doc_manager.create_document(
-            "JavaScript Tutorial",
-            "JavaScript basics. javascript functions. JAVASCRIPT everywhere!"
-        )
+        self.doc_manager.create_documents([
+            ("Test Document 1",
+             "This is a TEST document with test and Test words."),
+            ("Python Guide",
+             "Python programming. python is great. PYTHON rocks!"),
+            ("JavaScript Tutorial",
+             "JavaScript basics. javascript functions. JAVASCRIPT everywhere!"),
+        ])
     
     def show_search(self):
         """Show global search dialog"""
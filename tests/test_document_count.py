@@ -3,6 +3,7 @@ Test script for document and heading count display
 """
 
 import sys
+import random
 from PySide6.QtWidgets import QApplication, QMainWindow, QHBoxLayout, QWidget, QSplitter, QPushButton, QVBoxLayout
 from PySide6.QtCore import Qt, QTimer
 
@@ -61,7 +62,7 @@ class TestWindow(QMainWindow):
         # Connect signals
         self.sidebar.document_created.connect(self.create_document)
         self.sidebar.document_deleted.connect(self.delete_document)
-        self.editor.text_changed.connect(self.update_outline)
+        self.editor.text_changed.connect(self.update_outline, Qt.QueuedConnection)
         
         # Create initial test documents
         QTimer.singleShot(100, self.create_initial_documents)
@@ -89,10 +90,10 @@ class TestWindow(QMainWindow):
     
     def create_initial_documents(self):
         """Create some initial test documents"""
-        # Document 1
-        self.doc_manager.create_document(
-            "Welcome Document",
-            """# Welcome to Markdown Editor
+        self.doc_manager.create_documents([
+            # Document 1
+            ("Welcome Document",
+             """# Welcome to Markdown Editor
 
 ## Features
 This editor has many great features.
@@ -102,13 +103,11 @@ Create, edit, and delete documents.
 
 ### Real-time Preview
 See your markdown rendered instantly.
-"""
-        )
-        
-        # Document 2
-        self.doc_manager.create_document(
-            "Quick Notes",
-            """# Quick Notes
+"""),
+            
+            # Document 2
+            ("Quick Notes",
+             """# Quick Notes
 
 ## Todo
 - Task 1
@@ -116,21 +115,20 @@ See your markdown rendered instantly.
 
 ## Ideas
 Some random ideas here.
-"""
-        )
-        
-        # Document 3
-        self.doc_manager.create_document(
-            "Simple Doc",
-            "Just a simple document without many headings."
-        )
+"""),
+            
+            # Document 3
+            ("Simple Doc",
+             "Just a simple document without many headings.")
+        ])
         
         self.refresh_documents()
     
     def refresh_documents(self):
-        """Refresh the document list"""
-        documents = self.doc_manager.get_all_documents(load_content=False)
-        self.sidebar.update_documents(documents)
+        """Load the first page of the document list (initial seed only)"""
+        total = self.doc_manager.count_documents()
+        documents = self.doc_manager.list_documents(0, 200)
+        self.sidebar.update_documents(documents, total)
         
         # Load first document if available
         if documents:
@@ -141,7 +139,6 @@ Some random ideas here.
     
     def add_test_document(self):
         """Add a single test document"""
-        import random
         doc_num = random.randint(1000, 9999)
         
         content = f"""# Test Document {doc_num}
@@ -162,47 +159,66 @@ Even more content.
 Very nested.
 """
         
-        self.doc_manager.create_document(f"Test Doc {doc_num}", content)
-        self.refresh_documents()
+        title = f"Test Doc {doc_num}"
+        doc_id = self.doc_manager.create_document(title, content)
+        self._show_new_document(Document(id=doc_id, title=title), content)
         print(f"✓ Added Test Doc {doc_num}")
     
     def add_multiple_documents(self):
         """Add multiple test documents"""
+        new_documents = []
         for i in range(5):
-            import random
             doc_num = random.randint(1000, 9999)
             
             num_headings = random.randint(2, 6)
-            content = f"# Document {doc_num}\n\n"
+            parts = [f"# Document {doc_num}\n\n"]
+            parts.extend(f"## Heading {j+1}\n\nSome content for heading {j+1}.\n\n"
+                         for j in range(num_headings))
+            content = "".join(parts)
             
-            for j in range(num_headings):
-                content += f"## Heading {j+1}\n\nSome content for heading {j+1}.\n\n"
-            
-            self.doc_manager.create_document(f"Doc {doc_num}", content)
+            new_documents.append((f"Doc {doc_num}", content))
         
-        self.refresh_documents()
+        doc_ids = self.doc_manager.create_documents(new_documents)
+        for doc_id, (title, content) in zip(doc_ids, new_documents):
+            self._show_new_document(Document(id=doc_id, title=title), content)
         print("✓ Added 5 documents")
     
     def clear_all_documents(self):
         """Clear all documents"""
         documents = self.doc_manager.get_all_documents(load_content=False)
-        for doc in documents:
-            self.doc_manager.delete_document(doc.id)
+        self.doc_manager.delete_documents([doc.id for doc in documents])
         
-        self.refresh_documents()
+        self.sidebar.update_documents([])
         self.editor.set_content("")
         self.sidebar.update_outline("")
         print("✓ Cleared all documents")
     
     def create_document(self, title: str):
         """Create a new document"""
-        self.doc_manager.create_document(title, f"# {title}\n\n")
-        self.refresh_documents()
+        content = f"# {title}\n\n"
+        doc_id = self.doc_manager.create_document(title, content)
+        self._show_new_document(Document(id=doc_id, title=title), content)
     
     def delete_document(self, doc_id: int):
         """Delete a document"""
         self.doc_manager.delete_document(doc_id)
-        self.refresh_documents()
+        self.sidebar.remove_document(doc_id)
+        
+        # Show the document that is now first, as a full refresh would
+        if self.sidebar.documents:
+            doc = self.doc_manager.get_document(self.sidebar.documents[0].id)
+            if doc:
+                self.editor.set_content(doc.content)
+                self.sidebar.update_outline(doc.content)
+        else:
+            self.editor.set_content("")
+            self.sidebar.update_outline("")
+    
+    def _show_new_document(self, doc: Document, content: str):
+        """Add a freshly created document to the sidebar and open it"""
+        self.sidebar.add_document(doc)
+        self.editor.set_content(content)
+        self.sidebar.update_outline(content)
     
     def update_outline(self, content: str):
         """Update outline when content changes"""
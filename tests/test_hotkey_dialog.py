@@ -4,6 +4,8 @@ Test script for hotkey dialog
 
 import sys
 from PySide6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget, QPushButton
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QKeySequence, QShortcut
 
 # Add src to path
 sys.path.insert(0, 'src')
@@ -16,6 +18,7 @@ class TestWindow(QMainWindow):
         super().__init__()
         self.setWindowTitle("Hotkey Dialog Test")
         self.setGeometry(100, 100, 400, 200)
+        self.hotkey_dialog = None
         
         # Create central widget
         central = QWidget()
@@ -28,6 +31,9 @@ class TestWindow(QMainWindow):
         show_button.setStyleSheet("font-size: 14px; padding: 20px;")
         layout.addWidget(show_button)
         
+        # F1 is matched by Qt's shortcut map, not a Python keyPressEvent per key
+        QShortcut(QKeySequence(Qt.Key_F1), self, activated=self.show_hotkeys)
+        
         print("="*60)
         print("HOTKEY DIALOG TEST")
         print("="*60)
@@ -45,14 +51,12 @@ class TestWindow(QMainWindow):
     
     def show_hotkeys(self):
         """Show the hotkey dialog"""
-        HotkeyDialog.show_hotkeys(self)
-    
-    def keyPressEvent(self, event):
-        """Handle F1 key press"""
-        if event.key() == 0x01000030:  # F1 key
-            self.show_hotkeys()
-        else:
-            super().keyPressEvent(event)
+        # Built once; later presses just bring the existing dialog back
+        if self.hotkey_dialog is None:
+            self.hotkey_dialog = HotkeyDialog(self)
+        self.hotkey_dialog.show()
+        self.hotkey_dialog.raise_()
+        self.hotkey_dialog.activateWindow()
 
 
 if __name__ == '__main__':
@@ -5,25 +5,21 @@ Test script to verify image paste functionality
 
 import sys
 from PySide6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget, QPushButton, QLabel
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap, QClipboard
-from PySide6.QtWebEngineCore import QWebEngineUrlScheme
+from PySide6.QtCore import Qt, QThreadPool
+from PySide6.QtGui import QClipboard
 from ui.preview_widget import PreviewWidget
 from core.document_manager import DocumentManager
 from core.image_handler import ImageHandler
+from _shared_profile import get_profile
+from _util import PasteSignals, PasteWorker, ensure_doc_dir
 
 
 def main():
-    # Register custom URL scheme BEFORE creating QApplication
-    scheme = QWebEngineUrlScheme(b"image")
-    scheme.setFlags(QWebEngineUrlScheme.SecureScheme | QWebEngineUrlScheme.LocalScheme)
-    QWebEngineUrlScheme.registerScheme(scheme)
-    
+    # The image:// scheme is registered once when ui.preview_widget is imported
     app = QApplication(sys.argv)
     
     # Create test components
-    import os
-    os.makedirs("tests/doc", exist_ok=True)
+    ensure_doc_dir()
     doc_manager = DocumentManager("tests/doc/test_image_paste.db")
     image_handler = ImageHandler(doc_manager)
     
@@ -41,7 +37,7 @@ def main():
     layout = QVBoxLayout(central_widget)
     
     # Add preview widget
-    preview = PreviewWidget(image_handler)
+    preview = PreviewWidget(image_handler, profile=get_profile())
     layout.addWidget(preview)
     
     # Add test button
@@ -51,19 +47,31 @@ def main():
     status_label = QLabel("Ready - Copy an image to clipboard and click the button")
     layout.addWidget(status_label)
     
+    paste_signals = PasteSignals()
+    
     def test_paste():
         try:
-            if image_handler.handle_paste():
-                status_label.setText("Image pasted successfully!")
-                # Update preview with test content including the pasted image
-                content = doc_manager.get_document(doc_id).content
-                preview.update_content(content)
-            else:
+            # Clipboard access must stay on the GUI thread; encoding and storage run in the pool
+            image = image_handler.grab_clipboard_image()
+            if image.isNull():
                 status_label.setText("No image in clipboard")
+                return
+            status_label.setText("Pasting image...")
+            QThreadPool.globalInstance().start(PasteWorker(image_handler, image, paste_signals))
         except Exception as e:
             status_label.setText(f"Error: {str(e)}")
     
+    def on_paste_finished(success):
+        if success:
+            status_label.setText("Image pasted successfully!")
+            # Update preview with test content including the pasted image
+            content = doc_manager.get_document(doc_id).content
+            preview.update_content(content)
+        else:
+            status_label.setText("Image paste failed")
+    
     test_button.clicked.connect(test_paste)
+    paste_signals.finished.connect(on_paste_finished, Qt.QueuedConnection)
     
     # Connect image handler signal
     def on_image_pasted(markdown_syntax):
@@ -73,7 +81,7 @@ def main():
         doc_manager.update_document(doc_id, content=new_content)
         status_label.setText(f"Image added: {markdown_syntax}")
     
-    image_handler.image_pasted.connect(on_image_pasted)
+    image_handler.image_pasted.connect(on_image_pasted, Qt.QueuedConnection)
     
     # Set initial content
     preview.update_content("# Test Document\n\nThis is a test document.\n\nPaste an image to test the functionality.")
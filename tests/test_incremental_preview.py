@@ -5,12 +5,11 @@ Test incremental preview parsing optimization
 import sys
 import time
 from PySide6.QtWidgets import QApplication
+from PySide6.QtTest import QSignalSpy
 from ui.preview_widget import PreviewWidget
 
-def test_incremental_parsing():
+def test_incremental_parsing(qapp):
     """Test that incremental parsing improves performance"""
-    app = QApplication(sys.argv)
-    
     # Create preview widget
     preview = PreviewWidget()
     
@@ -26,17 +25,17 @@ def test_incremental_parsing():
     print(f"Document size: {len(markdown_content)} bytes")
     print(f"Incremental threshold: {preview._incremental_threshold} bytes")
     
+    # Renders are timed until the page reports them, not with fixed sleeps
+    render_spy = QSignalSpy(preview.render_complete)
+    
     # First render (cold cache)
     start = time.time()
     preview.update_content(markdown_content)
-    # Wait for render timer
-    app.processEvents()
-    time.sleep(0.15)  # Wait for debounce timer
-    app.processEvents()
+    render_spy.wait(2000)
     first_render_time = time.time() - start
     
     print(f"\nFirst render time: {first_render_time:.3f}s")
-    print(f"Block cache size: {len(preview._block_cache)}")
+    print(f"Block cache size: {preview.get_cache_stats()['block_cache_size']}")
     
     # Modify only one section
     modified_doc = markdown_content.replace("Section 50", "Section 50 MODIFIED")
@@ -44,13 +43,11 @@ def test_incremental_parsing():
     # Second render (should use cached blocks)
     start = time.time()
     preview.update_content(modified_doc)
-    app.processEvents()
-    time.sleep(0.15)
-    app.processEvents()
+    render_spy.wait(2000)
     second_render_time = time.time() - start
     
     print(f"\nSecond render time (with cache): {second_render_time:.3f}s")
-    print(f"Block cache size: {len(preview._block_cache)}")
+    print(f"Block cache size: {preview.get_cache_stats()['block_cache_size']}")
     
     # Get cache stats
     stats = preview.get_cache_stats()
@@ -67,4 +64,4 @@ def test_incremental_parsing():
     print("\nTest completed successfully!")
 
 if __name__ == "__main__":
-    test_incremental_parsing()
+    test_incremental_parsing(QApplication(sys.argv))
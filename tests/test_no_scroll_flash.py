@@ -8,10 +8,8 @@ from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import QTimer
 from ui.preview_widget import PreviewWidget
 
-def test_no_scroll_flash():
+def test_no_scroll_flash(qapp):
     """Test that scroll position restoration happens without visible jump"""
-    app = QApplication(sys.argv)
-    
     # Create preview widget
     preview = PreviewWidget()
     preview.show()
@@ -34,9 +32,9 @@ def test_no_scroll_flash():
     preview.update_content(markdown_content)
     
     # Wait for initial render
-    app.processEvents()
+    qapp.processEvents()
     time.sleep(0.2)
-    app.processEvents()
+    qapp.processEvents()
     
     print("[2] Scrolling to position 800px...")
     # Scroll to specific position
@@ -159,12 +157,12 @@ def test_no_scroll_flash():
         print("=" * 60)
         
         # Exit
-        QTimer.singleShot(1000, app.quit)
+        QTimer.singleShot(1000, qapp.quit)
     
     preview.web_view.page().runJavaScript(scroll_script, on_scrolled)
     
     # Run the app
-    sys.exit(app.exec())
+    qapp.exec()
 
 if __name__ == "__main__":
-    test_no_scroll_flash()
+    test_no_scroll_flash(QApplication(sys.argv))
@@ -4,7 +4,7 @@ Test script for outline navigation
 
 import sys
 from PySide6.QtWidgets import QApplication, QMainWindow, QHBoxLayout, QWidget, QSplitter
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 
 # Add src to path
 sys.path.insert(0, 'src')
@@ -44,6 +44,13 @@ class TestWindow(QMainWindow):
         self.sidebar.outline_item_clicked.connect(self.navigate_to_heading)
         self.editor.text_changed.connect(self.on_text_changed)
         
+        # Trailing-edge debounce: a burst of keystrokes becomes one preview + outline update
+        self._pending_content = None
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(200)
+        self._refresh_timer.timeout.connect(self._flush_pending_content)
+        
         # Set test content
         test_markdown = """# Main Title
 
@@ -96,9 +103,16 @@ Very nested content.
         print("4. The heading should be highlighted briefly")
     
     def on_text_changed(self, content):
-        """Update preview and outline when text changes"""
-        self.preview.update_content(content)
-        self.sidebar.update_outline(content)
+        """Update preview and outline once typing pauses"""
+        self._pending_content = content
+        self._refresh_timer.start()
+    
+    def _flush_pending_content(self):
+        """Push the latest editor content to the preview and outline"""
+        content, self._pending_content = self._pending_content, None
+        if content is not None:
+            self.preview.update_content(content)
+            self.sidebar.update_outline(content)
     
     def navigate_to_heading(self, heading_text):
         """Navigate to a specific heading"""
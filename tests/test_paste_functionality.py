@@ -5,26 +5,22 @@ Test script to verify both text and image paste functionality
 
 import sys
 from PySide6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget, QPushButton, QLabel, QTextEdit
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap
-from PySide6.QtWebEngineCore import QWebEngineUrlScheme
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QImage
 from ui.editor_widget import EditorWidget
 from ui.preview_widget import PreviewWidget
 from core.document_manager import DocumentManager
 from core.image_handler import ImageHandler
+from _shared_profile import get_profile
+from _util import ensure_doc_dir
 
 
 def main():
-    # Register custom URL scheme BEFORE creating QApplication
-    scheme = QWebEngineUrlScheme(b"image")
-    scheme.setFlags(QWebEngineUrlScheme.SecureScheme | QWebEngineUrlScheme.LocalScheme)
-    QWebEngineUrlScheme.registerScheme(scheme)
-    
+    # The image:// scheme is registered once when ui.preview_widget is imported
     app = QApplication(sys.argv)
     
     # Create test components
-    import os
-    os.makedirs("tests/doc", exist_ok=True)
+    ensure_doc_dir()
     doc_manager = DocumentManager("tests/doc/test_paste.db")
     image_handler = ImageHandler(doc_manager)
     
@@ -47,7 +43,7 @@ def main():
     layout.addWidget(editor)
     
     # Add preview widget
-    preview = PreviewWidget(image_handler)
+    preview = PreviewWidget(image_handler, profile=get_profile())
     layout.addWidget(preview)
     
     # Add test buttons
@@ -72,19 +68,47 @@ def main():
     
     def copy_test_image():
         """Copy test image to clipboard"""
-        # Create a simple colored pixmap
-        pixmap = QPixmap(200, 100)
-        pixmap.fill(Qt.red)
+        # Create a simple colored image (CPU-side, what the clipboard serializes anyway)
+        image = QImage(200, 100, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.red)
         
         clipboard = QApplication.clipboard()
-        clipboard.setPixmap(pixmap)
+        clipboard.setImage(image)
         status_label.setText("Test image copied to clipboard - now try Ctrl+V in editor")
     
+    # Coalesce keystroke bursts into a single UPDATE
+    save_timer = QTimer()
+    save_timer.setSingleShot(True)
+    save_timer.setInterval(300)
+    pending_content = None
+    
+    def flush_pending_save():
+        """Write the latest editor content to the database"""
+        nonlocal pending_content
+        if pending_content is not None:
+            content, pending_content = pending_content, None
+            doc_manager.update_document(doc_id, content=content)
+    
+    # Trailing-edge debounce for the preview: one render per pause in typing
+    preview_timer = QTimer()
+    preview_timer.setSingleShot(True)
+    preview_timer.setInterval(200)
+    pending_preview = None
+    
+    def flush_pending_preview():
+        """Render the latest editor content"""
+        nonlocal pending_preview
+        if pending_preview is not None:
+            content, pending_preview = pending_preview, None
+            preview.update_content(content)
+    
     def on_editor_text_changed(content):
-        """Update preview when editor content changes"""
-        preview.update_content(content)
-        # Update document
-        doc_manager.update_document(doc_id, content=content)
+        """Update preview and document once typing pauses"""
+        nonlocal pending_content, pending_preview
+        pending_preview = content
+        preview_timer.start()
+        pending_content = content
+        save_timer.start()
     
     def on_paste_requested():
         """Handle paste request from editor"""
@@ -102,9 +126,12 @@ def main():
     # Connect signals
     copy_text_button.clicked.connect(copy_test_text)
     copy_image_button.clicked.connect(copy_test_image)
+    save_timer.timeout.connect(flush_pending_save)
+    preview_timer.timeout.connect(flush_pending_preview)
+    app.aboutToQuit.connect(flush_pending_save)
     editor.text_changed.connect(on_editor_text_changed)
     editor.paste_requested.connect(on_paste_requested)
-    image_handler.image_pasted.connect(on_image_pasted)
+    image_handler.image_pasted.connect(on_image_pasted, Qt.QueuedConnection)
     
     # Set initial preview content
     preview.update_content("# Paste Test\n\nTest both text and image pasting:\n\n")
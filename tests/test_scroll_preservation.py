@@ -8,10 +8,8 @@ from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import QTimer
 from ui.preview_widget import PreviewWidget
 
-def test_scroll_preservation():
+def test_scroll_preservation(qapp):
     """Test that scroll position is preserved after content updates"""
-    app = QApplication(sys.argv)
-    
     # Create preview widget
     preview = PreviewWidget()
     preview.show()
@@ -30,9 +28,9 @@ def test_scroll_preservation():
     preview.update_content(markdown_content)
     
     # Wait for initial render
-    app.processEvents()
+    qapp.processEvents()
     time.sleep(0.2)
-    app.processEvents()
+    qapp.processEvents()
     
     print("Step 2: Scrolling to middle of document...")
     # Scroll to middle
@@ -48,8 +46,12 @@ def test_scroll_preservation():
     })();
     """
     
+    saved_position = 0
+    
     def on_scrolled(position):
+        nonlocal saved_position
         print(f"  Scrolled to position: {position}")
+        saved_position = position
         
         # Wait a bit then modify content
         QTimer.singleShot(500, modify_content)
@@ -74,24 +76,24 @@ def test_scroll_preservation():
             print(f"  Final scroll position: {final_position}")
             
             # Check if position is approximately the same
-            if abs(final_position - preview._saved_scroll_position) < 50:
+            if abs(final_position - saved_position) < 50:
                 print("\n✓ SUCCESS: Scroll position preserved!")
             else:
-                print(f"\n✗ FAILED: Position changed from {preview._saved_scroll_position} to {final_position}")
+                print(f"\n✗ FAILED: Position changed from {saved_position} to {final_position}")
             
-            print(f"\nSaved position: {preview._saved_scroll_position}")
+            print(f"\nSaved position: {saved_position}")
             print(f"Final position: {final_position}")
-            print(f"Difference: {abs(final_position - preview._saved_scroll_position)} pixels")
+            print(f"Difference: {abs(final_position - saved_position)} pixels")
             
             # Exit after a moment
-            QTimer.singleShot(1000, app.quit)
+            QTimer.singleShot(1000, qapp.quit)
         
         preview.web_view.page().runJavaScript(check_script, on_position_checked)
     
     preview.web_view.page().runJavaScript(scroll_script, on_scrolled)
     
     # Run the app
-    sys.exit(app.exec())
+    qapp.exec()
 
 if __name__ == "__main__":
-    test_scroll_preservation()
+    test_scroll_preservation(QApplication(sys.argv))
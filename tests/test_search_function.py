@@ -125,23 +125,23 @@ def test_search(doc_manager):
     results = doc_manager.search_documents("Python")
     print(f"   Found {len(results)} document(s)")
     for result in results:
-        print(f"   - {result['title']}: {result['match_count']} match(es)")
+        print(f"   - {result.title}: {result.match_count} match(es)")
     
     # Test 2: Search for "function"
     print("\n2. Searching for 'function' (case-insensitive):")
     results = doc_manager.search_documents("function", case_sensitive=False)
     print(f"   Found {len(results)} document(s)")
     for result in results:
-        print(f"   - {result['title']}: {result['match_count']} match(es)")
-        if result['content_matches']:
-            print(f"     Context: {result['content_matches'][0][:80]}...")
+        print(f"   - {result.title}: {result.match_count} match(es)")
+        if result.content_matches:
+            print(f"     Context: {result.content_matches[0][:80]}...")
     
     # Test 3: Search for "John"
     print("\n3. Searching for 'John':")
     results = doc_manager.search_documents("John")
     print(f"   Found {len(results)} document(s)")
     for result in results:
-        print(f"   - {result['title']}: {result['match_count']} match(es)")
+        print(f"   - {result.title}: {result.match_count} match(es)")
     
     # Test 4: Case-sensitive search
     print("\n4. Searching for 'javascript' (case-sensitive):")
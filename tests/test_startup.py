@@ -0,0 +1,27 @@
+"""
+Test that the main window opens the first stored document on startup
+"""
+
+from core.document_manager import DocumentManager
+
+
+def test_startup_loads_first_document(qapp, tmp_path, monkeypatch):
+    """A non-empty database should leave a document loaded after MainWindow is built"""
+    # MainWindow opens documents.db and settings.json relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    seed = DocumentManager("documents.db")
+    doc_id = seed.create_document("Startup", "# Startup\n\nLoaded on launch.")
+    seed.close()
+    
+    from ui import main_window
+    errors = []
+    monkeypatch.setattr(main_window.QMessageBox, "critical",
+                        lambda parent, title, text: errors.append(text))
+    
+    window = main_window.MainWindow()
+    try:
+        assert errors == []
+        assert window.current_document_id == doc_id
+        assert "Loaded on launch." in window.editor.get_content()
+    finally:
+        window.close()